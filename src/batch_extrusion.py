@@ -0,0 +1,235 @@
+"""
+Extrusão em lote de polígonos lidos de arquivo (CSV ou SVG), num pool de processos.
+
+Uso:
+    python batch_extrusion.py contornos.csv --depth 1.0 --workers 8
+    python batch_extrusion.py desenho.svg --size 2.0 --cap-mode scanline
+
+CSV: uma linha por vértice, "id,x,y" (cabeçalho opcional); linhas seguidas
+com o mesmo id formam um polígono.
+
+SVG: elementos <polygon points="..."> e <path d="..."> com comandos
+M/L/H/V/Z (absolutos ou relativos); cada subcaminho vira um polígono. O eixo
+y do SVG aponta para baixo e é invertido.
+
+Cada polígono é validado (Polygon.is_valid_for_extrusion: colinearidade e
+auto-interseção), preenchido (scanline na densidade fill_density do
+ExtrudedObject, para as estatísticas) e extrudado (ExtrudedObject) num
+processo de trabalho. Os vértices são escalados para
+caber em `size` unidades do mundo, centrados na origem. extrude_file()
+devolve os objetos prontos para a cena, dispostos lado a lado numa grade;
+com export_dir, cada malha soldada também é gravada como .obj.
+"""
+import argparse
+import contextlib
+import csv
+import io
+import math
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+from object.extruded_object import ExtrudedObject
+from object.mesh_builder import write_obj
+from polygon_filling.assets.polygon import Polygon
+from polygon_filling.assets.filling import polygon_filling_spans
+from polygon_filling.assets.spans import SpanSet
+
+
+def load_csv(path):
+    """[(nome, [[x, y], ...]), ...] a partir de linhas "id,x,y"."""
+    polygons = []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            if len(row) < 3 or not row[0].strip():
+                continue
+            try:
+                x, y = float(row[1]), float(row[2])
+            except ValueError:
+                # Cabeçalho ou linha inválida
+                continue
+            name = row[0].strip()
+            if not polygons or polygons[-1][0] != name:
+                polygons.append((name, []))
+            polygons[-1][1].append([x, y])
+    return polygons
+
+
+_PATH_TOKENS = re.compile(r'[MmLlHhVvZz]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+def parse_svg_path(d):
+    """Subcaminhos [[x, y], ...] de um atributo d com comandos M/L/H/V/Z."""
+    paths, current = [], []
+    x = y = 0.0
+    command = None
+    tokens = _PATH_TOKENS.findall(d)
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token.isalpha():
+            command = token
+            i += 1
+            if command in 'Zz':
+                if current:
+                    paths.append(current)
+                    x, y = current[0]
+                current = []
+            continue
+        if command is None:
+            raise ValueError(f"Caminho SVG sem comando inicial: '{d[:30]}'")
+
+        relative = command.islower()
+        if command in 'Hh':
+            x = x + float(token) if relative else float(token)
+            i += 1
+        elif command in 'Vv':
+            y = y + float(token) if relative else float(token)
+            i += 1
+        else:
+            dx, dy = float(tokens[i]), float(tokens[i + 1])
+            x, y = (x + dx, y + dy) if relative else (dx, dy)
+            i += 2
+            if command in 'Mm':
+                if current:
+                    paths.append(current)
+                current = []
+                # Pares seguintes ao M são tratados como L
+                command = 'l' if relative else 'L'
+        current.append([x, y])
+    if current:
+        paths.append(current)
+    return paths
+
+def load_svg(path):
+    """[(nome, [[x, y], ...]), ...] dos <polygon> e <path> do SVG (y invertido)."""
+    polygons = []
+    for index, element in enumerate(ET.parse(path).iter()):
+        tag = element.tag.rsplit('}', 1)[-1]
+        name = element.get('id') or f"{tag}{index}"
+        if tag == 'polygon':
+            values = [float(v) for v in re.split(r'[\s,]+', element.get('points', '').strip()) if v]
+            outlines = [[[values[k], values[k + 1]] for k in range(0, len(values) - 1, 2)]]
+        elif tag == 'path':
+            outlines = parse_svg_path(element.get('d', ''))
+        else:
+            continue
+        for part, outline in enumerate(outlines):
+            # Ponto final repetido (caminho fechado explicitamente) não é um vértice novo
+            if len(outline) > 1 and outline[0] == outline[-1]:
+                outline = outline[:-1]
+            polygons.append((name if len(outlines) == 1 else f"{name}_{part}", [[vx, -vy] for vx, vy in outline]))
+    return polygons
+
+def load_polygons(path):
+    """Escolhe o leitor pela extensão (.csv ou .svg)."""
+    extension = os.path.splitext(str(path))[1].lower()
+    if extension == '.csv':
+        return load_csv(path)
+    if extension == '.svg':
+        return load_svg(path)
+    raise ValueError(f"Formato '{extension}' não suportado (use .csv ou .svg)")
+
+def fit_to_size(vertices, size):
+    """Escala os vértices para caber em `size` unidades, centrados na origem."""
+    xs = [v[0] for v in vertices]
+    ys = [v[1] for v in vertices]
+    cx, cy = (min(xs) + max(xs)) / 2.0, (min(ys) + max(ys)) / 2.0
+    extent = max(max(xs) - min(xs), max(ys) - min(ys)) or 1.0
+    scale = size / extent
+    return [[(x - cx) * scale, (y - cy) * scale] for x, y in zip(xs, ys)]
+
+
+def extrude_polygon(job):
+    """
+    Valida, preenche e extruda um polígono: job = (nome, vértices, depth, size,
+    cap_mode, material, fill_density). Retorna (nome, objeto ou None, mensagem).
+    """
+    name, vertices, depth, size, cap_mode, material, fill_density = job
+    if len(vertices) < 3:
+        return name, None, "menos de 3 vértices"
+
+    polygon = Polygon()
+    for x, y in fit_to_size(vertices, size):
+        polygon.add_vertex(x, y)
+
+    if not polygon.is_valid_for_extrusion():
+        crossings = polygon.find_self_intersections()
+        if crossings:
+            return name, None, f"{len(crossings)} par(es) de arestas se cruzam"
+        return name, None, "vértices consecutivos colineares"
+
+    # Preenchimento no espaço do mundo, na mesma densidade das tampas por scanline
+    spans = SpanSet.from_spans(polygon_filling_spans(
+        [[x * fill_density, y * fill_density] for x, y in polygon.vertices]))
+
+    # A geração da geometria imprime progresso; no lote isso só polui a saída
+    with contextlib.redirect_stdout(io.StringIO()):
+        obj = ExtrudedObject([[x, y, 0.0] for x, y in polygon.vertices], depth,
+                             material=material, cap_mode=cap_mode, fill_density=fill_density)
+    return name, obj, f"{len(obj.faces)} faces, {len(spans)} segmentos, {spans.hole_rows()} linhas côncavas"
+
+
+def extrude_file(path, depth=1.0, size=2.0, cap_mode='triangulated', material='white_plastic',
+                 workers=0, spacing=None, fill_density=40.0, verbose=False, report=print, export_dir=None):
+    """
+    Lê os polígonos do arquivo e extruda cada um num pool de processos
+    (workers <= 1: no próprio processo). Os objetos saem numa grade no plano
+    XY com `spacing` unidades entre centros. Com export_dir, grava a malha
+    de cada objeto em <export_dir>/<nome>.obj. Retorna a lista de objetos.
+    """
+    polygons = load_polygons(path)
+    jobs = [(name, vertices, depth, size, cap_mode, material, fill_density) for name, vertices in polygons]
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+
+    start = time.perf_counter()
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Lotes por processo: cada tarefa é pequena, o custo de IPC domina sem chunksize
+            results = list(pool.map(extrude_polygon, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    else:
+        results = [extrude_polygon(job) for job in jobs]
+    elapsed = time.perf_counter() - start
+
+    objects = []
+    spacing = spacing if spacing is not None else size * 1.25
+    columns = max(1, math.ceil(math.sqrt(len(jobs))))
+    for name, obj, message in results:
+        if obj is None:
+            report(f"{name}: rejeitado ({message})")
+            continue
+        if verbose:
+            report(f"{name}: {message}")
+        if export_dir is not None:
+            os.makedirs(export_dir, exist_ok=True)
+            write_obj(os.path.join(export_dir, re.sub(r'[^\w.-]', '_', name) + '.obj'), obj.vertices_3d, obj.faces)
+        row, column = divmod(len(objects), columns)
+        # set_position também renova a versão do objeto (cache do PhongManual)
+        obj.set_position(column * spacing, -row * spacing, 0.0)
+        objects.append(obj)
+
+    rate = len(jobs) / elapsed if elapsed > 0 else float('inf')
+    report(f"{len(objects)}/{len(polygons)} polígono(s) extrudado(s) em {elapsed:.2f} s "
+           f"({rate:.1f} polígonos/s, {workers} processo(s))")
+    return objects
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extruda em lote os polígonos de um arquivo CSV ou SVG.")
+    parser.add_argument('input', help="arquivo .csv (id,x,y) ou .svg")
+    parser.add_argument('--depth', type=float, default=1.0, help="profundidade da extrusão")
+    parser.add_argument('--size', type=float, default=2.0, help="tamanho de cada objeto no mundo")
+    parser.add_argument('--cap-mode', choices=('triangulated', 'scanline'), default='triangulated')
+    parser.add_argument('--material', default='white_plastic')
+    parser.add_argument('--workers', type=int, default=0, help="processos (0 = todos os núcleos)")
+    parser.add_argument('--export', metavar='DIR', help="grava cada malha como DIR/<nome>.obj")
+    parser.add_argument('-v', '--verbose', action='store_true', help="uma linha por polígono")
+    args = parser.parse_args(argv)
+
+    extrude_file(args.input, args.depth, args.size, args.cap_mode, args.material, args.workers,
+                 verbose=args.verbose, export_dir=args.export)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Microbenchmark da Edge Table do PhongManual.
+
+Compara, por triângulo, o percurso de scanline com arestas em dicionários
+(implementação anterior, reproduzida abaixo) com o ScanlineEdge (__slots__).
+O span é descartado (draw_scanline vazio) para medir só o custo da ET/AET.
+
+Uso (a partir de src/): python benchmarks/bench_edge_table.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from light.phong_manual import PhongManual
+
+
+def legacy_scanline(p0, p1, p2, draw_scanline):
+    """Laço de scanline original: arestas como dicionários e PA/PB recriados por linha."""
+    pts = sorted([p0, p1, p2], key=lambda p: p['y'])
+    ET = {}
+
+    def add_edge(pa, pb):
+        if pa['y'] == pb['y']:
+            return
+        if pa['y'] > pb['y']:
+            pa, pb = pb, pa
+        dy = pb['y'] - pa['y']
+        edge = {
+            'ymax': pb['y'],
+            'x': pa['x'], 'dx': (pb['x'] - pa['x']) / dy,
+            'wx': pa['wx'], 'd_wx': (pb['wx'] - pa['wx']) / dy,
+            'wy': pa['wy'], 'd_wy': (pb['wy'] - pa['wy']) / dy,
+            'wz': pa['wz'], 'd_wz': (pb['wz'] - pa['wz']) / dy,
+            'win_z': pa['win_z'], 'd_win_z': (pb['win_z'] - pa['win_z']) / dy,
+            'nx': pa['nx'], 'd_nx': (pb['nx'] - pa['nx']) / dy,
+            'ny': pa['ny'], 'd_ny': (pb['ny'] - pa['ny']) / dy,
+            'nz': pa['nz'], 'd_nz': (pb['nz'] - pa['nz']) / dy,
+        }
+        ET.setdefault(int(pa['y']), []).append(edge)
+
+    add_edge(pts[0], pts[1])
+    add_edge(pts[1], pts[2])
+    add_edge(pts[0], pts[2])
+    if not ET:
+        return
+
+    AET = []
+    y = min(ET.keys())
+    y_max_global = int(max(p['y'] for p in pts))
+    while y <= y_max_global:
+        if y in ET:
+            AET.extend(ET[y])
+        AET = [e for e in AET if e['ymax'] > y]
+        if len(AET) >= 2:
+            AET.sort(key=lambda e: e['x'])
+            e1, e2 = AET[0], AET[-1]
+            PA = {'x': e1['x'], 'wx': e1['wx'], 'wy': e1['wy'], 'wz': e1['wz'],
+                  'win_z': e1['win_z'], 'nx': e1['nx'], 'ny': e1['ny'], 'nz': e1['nz']}
+            PB = {'x': e2['x'], 'wx': e2['wx'], 'wy': e2['wy'], 'wz': e2['wz'],
+                  'win_z': e2['win_z'], 'nx': e2['nx'], 'ny': e2['ny'], 'nz': e2['nz']}
+            draw_scanline(y, PA, PB)
+        y += 1
+        for e in AET:
+            e['x'] += e['dx']
+            e['wx'] += e['d_wx']
+            e['wy'] += e['d_wy']
+            e['wz'] += e['d_wz']
+            e['win_z'] += e['d_win_z']
+            e['nx'] += e['d_nx']
+            e['ny'] += e['d_ny']
+            e['nz'] += e['d_nz']
+
+
+class EdgeOnlyRasterizer(PhongManual):
+    """PhongManual sem o custo do span: só a ET/AET é medida."""
+    def draw_scanline(self, y, pa, pb, shading):
+        pass
+
+
+def vertex(x, y):
+    return {'x': x, 'y': y, 'win_z': 0.5, 'wx': x * 0.01, 'wy': y * 0.01, 'wz': -5.0,
+            'nx': 0.0, 'ny': 0.0, 'nz': 1.0}
+
+
+def main():
+    rasterizer = EdgeOnlyRasterizer()
+    rasterizer.update_size(4096, 4096)
+
+    print(f"{'altura (linhas)':>16} {'dict (us)':>12} {'slots (us)':>12} {'speedup':>9}")
+    for height in (8, 32, 128, 512):
+        tri = (vertex(10.3, 5.2), vertex(200.7, 5.2 + height * 0.4), vertex(60.1, 5.2 + height))
+        repeat = max(20, 20000 // height)
+
+        legacy = timeit.timeit(lambda: legacy_scanline(*tri, lambda y, a, b: None), number=repeat)
+        current = timeit.timeit(lambda: rasterizer._rasterize_projected(*tri, None), number=repeat)
+
+        legacy_us = legacy / repeat * 1e6
+        current_us = current / repeat * 1e6
+        print(f"{height:>16} {legacy_us:>12.1f} {current_us:>12.1f} {legacy_us / current_us:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
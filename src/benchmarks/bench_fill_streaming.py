@@ -0,0 +1,69 @@
+"""
+Benchmark do preenchimento de polígonos grandes: lista completa x streaming.
+
+O polígono (um contorno ondulado com milhares de vértices) cobre dezenas de
+milhares de linhas. Para cada modo mede o tempo e o pico de memória
+(tracemalloc) de calcular e percorrer todos os segmentos:
+
+- polygon_filling: lista de tuplas inteira;
+- polygon_filling_spans: array estruturado inteiro;
+- iter_polygon_filling: blocos de linhas, um de cada vez.
+
+Uso (a partir de src/): python benchmarks/bench_fill_streaming.py
+"""
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from polygon_filling.assets.filling import polygon_filling, polygon_filling_spans, iter_polygon_filling
+
+
+def traced_polygon(rows, vertices=20000):
+    """Contorno fechado de altura `rows` com borda ondulada (vários spans por linha)."""
+    radius = rows / 2.0
+    polygon = []
+    for k in range(vertices):
+        angle = 2.0 * math.pi * k / vertices
+        r = radius * (0.8 + 0.2 * math.sin(23.0 * angle))
+        polygon.append([round(radius + r * math.cos(angle)), round(radius + r * math.sin(angle))])
+    return polygon
+
+
+def measure(consume):
+    tracemalloc.start()
+    start = time.perf_counter()
+    spans = consume()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return spans, elapsed, peak
+
+
+def main():
+    for rows in (20000, 60000):
+        polygon = traced_polygon(rows)
+
+        def full_list():
+            return len(polygon_filling(polygon))
+
+        def full_array():
+            return len(polygon_filling_spans(polygon))
+
+        def streaming(block_rows):
+            return lambda: sum(len(block) for block in iter_polygon_filling(polygon, block_rows))
+
+        print(f"\n{rows} linhas, {len(polygon)} vértices")
+        print(f"{'modo':>24} {'spans':>9} {'tempo (ms)':>11} {'pico (MiB)':>11}")
+        modes = [('lista de tuplas', full_list), ('array inteiro', full_array),
+                 ('streaming 4096 linhas', streaming(4096)), ('streaming 512 linhas', streaming(512))]
+        for name, consume in modes:
+            spans, elapsed, peak = measure(consume)
+            print(f"{name:>24} {spans:>9} {elapsed * 1000.0:>11.1f} {peak / 2**20:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
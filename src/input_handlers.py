@@ -6,6 +6,7 @@ from object.object_selection import pick_object
 
 def keyboard(key, x, y, polygon_modeler, selected_objects, camera, light_enabled, light):
     if polygon_modeler.is_modeling_active():
+        polygon_modeler.handle_keyboard(key)
         return
     
     step = 0.5 
@@ -209,8 +210,9 @@ def mouse(button, state, x, y, polygon_modeler, objects, selected_objects, camer
 
 
 def motion(x, y, polygon_modeler, camera):
-    # Não mudar cãmera durante modelagem
+    # Não mudar cãmera durante modelagem; o arrasto desenha à mão livre
     if polygon_modeler.is_modeling_active():
+        polygon_modeler.handle_motion(x, y)
         return
     
     io = imgui.get_io()
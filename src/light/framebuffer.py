@@ -0,0 +1,147 @@
+from OpenGL.GL import *
+from multiprocessing import shared_memory
+import numpy as np
+
+
+class SoftwareFramebuffer:
+    """
+    Buffers de cor e profundidade (NumPy) usados pela rasterização manual.
+    As linhas seguem a convenção do OpenGL: linha 0 é a base da janela.
+
+    Com shared=True os buffers ficam em memória compartilhada, para que
+    processos de trabalho (modo em tiles) escrevam diretamente neles.
+    Com gbuffer=True há também o G-buffer do modo deferred (posição e
+    normal no espaço do olho e índice do material de cada pixel).
+    """
+    # nome -> (canais extras, dtype, valor de limpeza)
+    BUFFERS = {
+        'color': ((3,), np.float32, 0.0),
+        'depth': ((), np.float32, 1.0),
+    }
+    GBUFFERS = {
+        'position': ((3,), np.float32, 0.0),
+        'normal': ((3,), np.float32, 0.0),
+        'material': ((), np.int32, -1),
+    }
+
+    def __init__(self, width=800, height=600, shared=False, gbuffer=False):
+        self.width = 0
+        self.height = 0
+        self.shared = shared
+        self.gbuffer = gbuffer
+        self.buffers = dict(self.BUFFERS, **(self.GBUFFERS if gbuffer else {}))
+        self._segments = {}
+        self._owner = True
+        for name in self.buffers:
+            setattr(self, name, None)
+        self.resize(width, height)
+
+    def _allocate(self, name, shape, dtype):
+        if not self.shared:
+            return np.empty(shape, dtype=dtype)
+
+        size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        segment = shared_memory.SharedMemory(create=True, size=size)
+        self._segments[name] = segment
+        return np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+
+    def resize(self, width, height):
+        width = max(int(width), 1)
+        height = max(int(height), 1)
+        if width == self.width and height == self.height:
+            return
+
+        self.release()
+        self.width = width
+        self.height = height
+        for name, (channels, dtype, _) in self.buffers.items():
+            setattr(self, name, self._allocate(name, (height, width) + channels, dtype))
+        self.clear()
+
+    def release(self):
+        """Libera a memória compartilhada (apenas o processo que a criou remove o segmento)."""
+        for name in self.buffers:
+            setattr(self, name, None)
+        for segment in self._segments.values():
+            segment.close()
+            if self._owner:
+                segment.unlink()
+        self._segments = {}
+
+    def shared_handles(self):
+        """Descrição serializável dos buffers compartilhados, para SoftwareFramebuffer.attach."""
+        names = {name: segment.name for name, segment in self._segments.items()}
+        return (self.width, self.height, names)
+
+    @classmethod
+    def attach(cls, handles):
+        """Abre, em outro processo, os buffers descritos por shared_handles()."""
+        width, height, names = handles
+        fb = cls.__new__(cls)
+        fb.width = width
+        fb.height = height
+        fb.shared = True
+        fb.gbuffer = 'material' in names
+        fb.buffers = dict(cls.BUFFERS, **(cls.GBUFFERS if fb.gbuffer else {}))
+        fb._owner = False
+        fb._segments = {}
+        for name, (channels, dtype, _) in fb.buffers.items():
+            segment = shared_memory.SharedMemory(name=names[name])
+            fb._segments[name] = segment
+            setattr(fb, name, np.ndarray((height, width) + channels, dtype=dtype, buffer=segment.buf))
+        return fb
+
+    def clear(self):
+        # Profundidade 1.0 = plano de fundo (far plane)
+        for name, (_, _, value) in self.buffers.items():
+            getattr(self, name).fill(value)
+
+    def covered(self):
+        """Máscara dos pixels escritos desde o último clear."""
+        return self.depth < 1.0
+
+    def present(self, x=0, y=0, zoom=1, first_row=0):
+        """
+        Compõe o buffer sobre a cena OpenGL com um único glDrawPixels.
+        A profundidade da cena é lida uma vez para manter a oclusão entre
+        objetos desenhados pelo OpenGL e os rasterizados manualmente.
+
+        zoom > 1 amplia cada pixel (prévia em baixa resolução) e first_row
+        omite as linhas do buffer abaixo dela.
+        """
+        covered = self.covered()[first_row:]
+        if not covered.any():
+            return
+
+        rows = self.height - first_row
+        y += first_row * zoom
+
+        # Com zoom, a profundidade da cena é amostrada no canto de cada bloco
+        scene_depth = glReadPixels(x, y, self.width * zoom, rows * zoom, GL_DEPTH_COMPONENT, GL_FLOAT)
+        scene_depth = np.asarray(scene_depth, dtype=np.float32).reshape(rows * zoom, self.width * zoom)
+        scene_depth = scene_depth[::zoom, ::zoom]
+
+        rgba = np.empty((rows, self.width, 4), dtype=np.float32)
+        rgba[..., :3] = self.color[first_row:]
+        rgba[..., 3] = covered & (self.depth[first_row:] <= scene_depth)
+
+        # glDrawPixels não deve passar pelo shader Phong (GLSL) ativo
+        program = glGetIntegerv(GL_CURRENT_PROGRAM)
+        glUseProgram(0)
+
+        glPushAttrib(GL_ENABLE_BIT | GL_COLOR_BUFFER_BIT | GL_PIXEL_MODE_BIT)
+        glDisable(GL_LIGHTING)
+        glDisable(GL_DEPTH_TEST)
+        glDisable(GL_TEXTURE_2D)
+        glDisable(GL_BLEND)
+
+        # Pixels não cobertos (alpha 0) são descartados
+        glEnable(GL_ALPHA_TEST)
+        glAlphaFunc(GL_GREATER, 0.5)
+
+        glPixelZoom(zoom, zoom)
+        glWindowPos2i(x, y)
+        glDrawPixels(self.width, rows, GL_RGBA, GL_FLOAT, rgba)
+
+        glPopAttrib()
+        glUseProgram(program)
@@ -0,0 +1,48 @@
+"""
+Escrita de imagens RGB (arrays float 0..1, linha 0 na base, como no
+SoftwareFramebuffer) em PNG ou PPM, sem dependências além de NumPy.
+"""
+
+import struct
+import zlib
+import numpy as np
+
+def to_rgb8(color):
+    """Converte o buffer de cor para bytes RGB de cima para baixo (ordem dos arquivos de imagem)."""
+    rgb = np.clip(np.asarray(color, dtype=np.float64)[::-1], 0.0, 1.0)
+    return np.ascontiguousarray((rgb * 255.0 + 0.5).astype(np.uint8))
+
+def write_ppm(path, color):
+    """PPM binário (P6)."""
+    rgb = to_rgb8(color)
+    height, width = rgb.shape[:2]
+    with open(path, 'wb') as f:
+        f.write(b'P6\n%d %d\n255\n' % (width, height))
+        f.write(rgb.tobytes())
+
+def write_png(path, color):
+    """PNG RGB de 8 bits, filtro 0 em todas as linhas."""
+    rgb = to_rgb8(color)
+    height, width = rgb.shape[:2]
+
+    # Cada linha começa com o byte do tipo de filtro
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = rgb.reshape(height, width * 3)
+
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body) & 0xFFFFFFFF)
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', header))
+        f.write(chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)))
+        f.write(chunk(b'IEND', b''))
+
+def write_image(path, color):
+    """Escolhe o formato pela extensão (.png ou .ppm)."""
+    if str(path).lower().endswith('.ppm'):
+        write_ppm(path, color)
+    else:
+        write_png(path, color)
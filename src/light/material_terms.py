@@ -0,0 +1,47 @@
+import numpy as np
+
+
+class MaterialTerms:
+    """
+    Termos de Phong pré-calculados para um par (material, cores da luz).
+
+    Os produtos Ia.Ka, I1.Kd e I1.Ks são constantes por objeto; calculá-los
+    uma vez deixa para o laço por pixel só as multiplicações-somas.
+    """
+    __slots__ = ('ambient', 'diffuse', 'specular', 'shininess',
+                 'ambient_rgb', 'diffuse_rgb', 'specular_rgb')
+
+    def __init__(self, material, light_colors):
+        ka = material.ambient[:3]
+        kd = material.diffuse[:3]
+        ks = material.specular[:3]
+
+        # Componente Ambiente: Ia . Ka
+        self.ambient = tuple(ka[i] * light_colors['amb'][i] for i in range(3))
+        # Produtos luz x material das componentes difusa e especular
+        self.diffuse = tuple(kd[i] * light_colors['dif'][i] for i in range(3))
+        self.specular = tuple(ks[i] * light_colors['spec'][i] for i in range(3))
+        self.shininess = material.shininess
+
+        # Versões NumPy para o caminho vetorizado
+        self.ambient_rgb = np.array(self.ambient)
+        self.diffuse_rgb = np.array(self.diffuse)
+        self.specular_rgb = np.array(self.specular)
+
+
+# Cache por valor: Material não é hashable e as cores da luz chegam como listas
+_terms_cache = {}
+_CACHE_LIMIT = 64
+
+def material_terms(material, light_colors):
+    """Retorna (criando se preciso) os MaterialTerms do par material/luz."""
+    key = (tuple(material.ambient), tuple(material.diffuse), tuple(material.specular),
+           material.shininess, tuple(light_colors['amb']), tuple(light_colors['dif']),
+           tuple(light_colors['spec']))
+    terms = _terms_cache.get(key)
+    if terms is None:
+        # Cores da luz editadas pela interface geram chaves novas a cada frame
+        if len(_terms_cache) >= _CACHE_LIMIT:
+            _terms_cache.clear()
+        terms = _terms_cache[key] = MaterialTerms(material, light_colors)
+    return terms
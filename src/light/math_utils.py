@@ -1,4 +1,5 @@
 import math
+import numpy as np
 
 def normalize(vector):
     norm = math.sqrt(vector[0]**2 + vector[1]**2 + vector[2]**2)
@@ -27,3 +28,19 @@ def cross(a, b):
         a[2] * b[0] - a[0] * b[2],  # Y = az*bx - ax*bz
         a[0] * b[1] - a[1] * b[0]   # Z = ax*by - ay*bx
     ]
+
+
+# ---- Versões vetorizadas (NumPy): operam sobre arrays (N, 3) ---- #
+
+def normalize_rows(vectors):
+    norm = np.sqrt(np.einsum('ij,ij->i', vectors, vectors))
+    # Vetores nulos continuam nulos (mesmo comportamento de normalize)
+    safe = np.where(norm == 0, 1.0, norm)
+    return vectors / safe[:, None]
+
+def dot_rows(v1, v2):
+    return np.einsum('ij,ij->i', v1, v2)
+
+def reflect_rows(i, n):
+    # R = I - 2.0 * dot(N, I) * N
+    return i - 2.0 * dot_rows(n, i)[:, None] * n
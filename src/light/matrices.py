@@ -0,0 +1,51 @@
+"""
+Matrizes de câmera e projeção sem contexto OpenGL (gluLookAt, gluPerspective, glOrtho).
+
+Todas seguem o layout retornado por glGetDoublev (column-major): com
+vetores-linha, P_transformado = P @ M, como em PhongManual._project_object.
+"""
+
+import math
+import numpy as np
+
+def look_at(eye, center, up=(0.0, 1.0, 0.0)):
+    """Equivalente a gluLookAt."""
+    eye = np.asarray(eye, dtype=np.float64)
+    f = np.asarray(center, dtype=np.float64) - eye
+    f /= np.linalg.norm(f)
+    s = np.cross(f, up)
+    s /= np.linalg.norm(s)
+    u = np.cross(s, f)
+
+    m = np.eye(4)
+    m[:3, 0] = s
+    m[:3, 1] = u
+    m[:3, 2] = -f
+    m[3, :3] = (-s @ eye, -u @ eye, f @ eye)
+    return m
+
+def perspective(fovy, aspect, near, far):
+    """Equivalente a gluPerspective (fovy em graus)."""
+    t = 1.0 / math.tan(math.radians(fovy) / 2.0)
+    m = np.zeros((4, 4))
+    m[0, 0] = t / aspect
+    m[1, 1] = t
+    m[2, 2] = (far + near) / (near - far)
+    m[2, 3] = -1.0
+    m[3, 2] = 2.0 * far * near / (near - far)
+    return m
+
+def ortho(left, right, bottom, top, near, far):
+    """Equivalente a glOrtho."""
+    m = np.eye(4)
+    m[0, 0] = 2.0 / (right - left)
+    m[1, 1] = 2.0 / (top - bottom)
+    m[2, 2] = -2.0 / (far - near)
+    m[3, 0] = -(right + left) / (right - left)
+    m[3, 1] = -(top + bottom) / (top - bottom)
+    m[3, 2] = -(far + near) / (far - near)
+    return m
+
+def model_view(obj, view):
+    """ModelView de um objeto: equivalente a glLoadMatrix(view) seguido de glMultMatrixf(obj._matrix)."""
+    return np.asarray(obj._matrix, dtype=np.float64).reshape(4, 4) @ view
@@ -1,20 +1,296 @@
 from OpenGL.GL import *
-from OpenGL.GLU import *
 import math
+import time
+import numpy as np
 from light.math_utils import *
+from light.framebuffer import SoftwareFramebuffer
+from light.material_terms import material_terms
+from light.tiled_rasterizer import TiledRasterizer
+
+def projected_vertex(window, eye, normal):
+    """Vértice projetado: janela (x, y, win_z), posição no olho (wx, wy, wz) e normal no olho."""
+    return {
+        'x': window[0],
+        'y': window[1],
+        'win_z': window[2],
+        'wx': eye[0],
+        'wy': eye[1],
+        'wz': eye[2],
+        'nx': normal[0],
+        'ny': normal[1],
+        'nz': normal[2],
+    }
+
+class ScanlineEdge:
+    """
+    Aresta da Edge Table: valores atuais dos atributos na linha de varredura
+    e o passo (d_<attr>) de cada um por linha. Com __slots__ o acesso é por
+    atributo fixo, sem dicionário por aresta.
+    """
+    __slots__ = ('y0', 'y_last', 'ymax',
+                 'x', 'd_x', 'wx', 'd_wx', 'wy', 'd_wy', 'wz', 'd_wz',
+                 'win_z', 'd_win_z', 'nx', 'd_nx', 'ny', 'd_ny', 'nz', 'd_nz')
+
+    def __init__(self, pa, pb):
+        # pa é o vértice de menor y; a primeira linha de varredura é a
+        # primeira linha inteira a partir dele
+        dy = pb['y'] - pa['y']
+        self.y0 = math.ceil(pa['y'])
+        self.ymax = pb['y']
+        # Última linha em que a aresta está ativa (y < ymax)
+        self.y_last = math.ceil(self.ymax) - 1
+
+        self.x = pa['x']
+        self.d_x = (pb['x'] - pa['x']) / dy
+        self.wx = pa['wx']
+        self.d_wx = (pb['wx'] - pa['wx']) / dy
+        self.wy = pa['wy']
+        self.d_wy = (pb['wy'] - pa['wy']) / dy
+        self.wz = pa['wz']
+        self.d_wz = (pb['wz'] - pa['wz']) / dy
+        self.win_z = pa['win_z']
+        self.d_win_z = (pb['win_z'] - pa['win_z']) / dy
+        self.nx = pa['nx']
+        self.d_nx = (pb['nx'] - pa['nx']) / dy
+        self.ny = pa['ny']
+        self.d_ny = (pb['ny'] - pa['ny']) / dy
+        self.nz = pa['nz']
+        self.d_nz = (pb['nz'] - pa['nz']) / dy
+
+        # Atributos avaliados na linha y0, não no vértice: sem isso arestas
+        # quase horizontais ultrapassam o x do outro vértice
+        self.advance(self.y0 - pa['y'])
+
+    def step(self):
+        """Avança a aresta uma linha de varredura."""
+        self.x += self.d_x
+        self.wx += self.d_wx
+        self.wy += self.d_wy
+        self.wz += self.d_wz
+        self.win_z += self.d_win_z
+        self.nx += self.d_nx
+        self.ny += self.d_ny
+        self.nz += self.d_nz
+
+    def advance(self, steps):
+        """Avança a aresta `steps` linhas de uma vez."""
+        self.x += self.d_x * steps
+        self.wx += self.d_wx * steps
+        self.wy += self.d_wy * steps
+        self.wz += self.d_wz * steps
+        self.win_z += self.d_win_z * steps
+        self.nx += self.d_nx * steps
+        self.ny += self.d_ny * steps
+        self.nz += self.d_nz * steps
+
 
 class PhongManual:
-    def __init__(self):
+    def __init__(self, framebuffer=None):
         self.width = 800
         self.height = 600
+        self.viewport_x = 0
+        self.viewport_y = 0
+        # Modo vetorizado: sombreia o span inteiro de uma vez com NumPy
+        self.vectorized = True
+        # Cor e profundidade da rasterização manual
+        self.framebuffer = framebuffer or SoftwareFramebuffer(self.width, self.height)
+        # Retângulo (x0, y0, x1, y1) onde a rasterização pode escrever; None = framebuffer inteiro
+        self.scissor = None
+        # Objetos registrados no frame atual, projetados só se o frame precisar ser rasterizado
+        self._jobs = []
+        # Triângulos projetados no frame atual, rasterizados em flush():
+        # (p0, p1, p2, índice em self._shading)
+        self._pending = []
+        # Parâmetros de sombreamento do frame: (light_pos, light_colors, material) por objeto
+        self._shading = []
+        # Modo deferred: rasteriza o G-buffer e ilumina uma vez por pixel visível
+        self.deferred = False
+        # Modo em tiles (pool de processos); None = rasterização serial
+        self.tiled = None
+        # Descarta triângulos de costas para a câmera (ordem anti-horária = frente)
+        self.cull_back_faces = True
+
+        # Modo progressivo: prévia em baixa resolução enquanto câmera/luz se movem
+        # e refinamento em faixas de linhas, dentro do orçamento, quando parado
+        self.progressive = False
+        self.frame_budget_ms = 16.0
+        self.preview_scale = 4
+        self._preview = None
+
+        # Cache entre frames: assinatura (matrizes, luz e versão de cada objeto)
+        # do último frame rasterizado; se não mudar, o framebuffer é reaproveitado
+        self._frame_key = []
+        self._last_key = None
+        # Linhas do framebuffer já refinadas em resolução total
+        self._refined_rows = 0
 
     def update_size(self, width, height):
         self.width = int(width)
         self.height = int(height)
+        self.framebuffer.resize(self.width, self.height)
+        self._last_key = None
+
+    def enable_tiled(self, enabled=True, workers=None, tile_size=64):
+        """Liga/desliga a rasterização em tiles num pool de processos."""
+        if enabled and self.tiled is None:
+            self.tiled = TiledRasterizer(tile_size, workers)
+        elif not enabled and self.tiled is not None:
+            self.tiled.shutdown()
+            self.tiled = None
+
+        # Os processos de trabalho precisam do framebuffer em memória compartilhada
+        self._rebuild_framebuffer()
+
+    def enable_deferred(self, enabled=True):
+        """Liga/desliga o sombreamento deferred (G-buffer + uma passada de iluminação)."""
+        self.deferred = enabled
+        self._rebuild_framebuffer()
+
+    def _rebuild_framebuffer(self):
+        shared = self.tiled is not None
+        if self.framebuffer.shared == shared and self.framebuffer.gbuffer == self.deferred:
+            return
+        self.framebuffer.release()
+        self.framebuffer = SoftwareFramebuffer(self.width, self.height, shared=shared, gbuffer=self.deferred)
+        self._last_key = None
+
+    def enable_progressive(self, enabled=True):
+        """Liga/desliga a renderização progressiva (prévia + refinamento por orçamento)."""
+        self.progressive = enabled
+        self._last_key = None
+
+    def shutdown(self):
+        """Encerra o pool de processos e libera a memória compartilhada."""
+        self.enable_tiled(False)
+
+    def begin_frame(self):
+        """
+        Inicia o frame, antes dos objetos. O framebuffer guarda o resultado do
+        frame anterior e só é limpo em present() se a assinatura do frame mudar.
+        """
+        self._jobs = []
+        self._pending = []
+        self._shading = []
+        self._frame_key = []
+
+    def flush(self):
+        """Projeta os objetos do frame e rasteriza seus triângulos (serial ou em tiles)."""
+        triangles = self._take_triangles()
+        if self.tiled is not None:
+            self.tiled.rasterize(triangles, self._shading, self.framebuffer, self.vectorized, self.deferred)
+            return
+        for triangle in triangles:
+            self._rasterize_projected(*triangle)
+        if self.deferred:
+            self.resolve()
+
+    def _take_triangles(self):
+        """Projeta os objetos registrados e retorna (esvaziando) os triângulos pendentes."""
+        jobs, self._jobs = self._jobs, []
+        for job in jobs:
+            self._project_object(*job)
+        triangles, self._pending = self._pending, []
+        return triangles
+
+    def resolve(self, region=None):
+        """
+        Passada de iluminação do modo deferred: Phong uma única vez por pixel
+        visível do G-buffer, agrupando os pixels pelo material.
+        region = (x0, y0, x1, y1) limita a passada a um retângulo.
+        """
+        fb = self.framebuffer
+        x0, y0, x1, y1 = region or (0, 0, fb.width, fb.height)
+        material = fb.material[y0:y1, x0:x1]
+        color = fb.color[y0:y1, x0:x1]
+
+        for index in np.unique(material[material >= 0]).tolist():
+            mask = material == index
+            pos_eye = fb.position[y0:y1, x0:x1][mask].astype(np.float64)
+            norm_eye = fb.normal[y0:y1, x0:x1][mask].astype(np.float64)
+            color[mask] = self.shade_vectorized(pos_eye, norm_eye, *self._shading[index])
+
+    def present(self):
+        """Envia o resultado da rasterização manual para a janela (uma chamada por frame)."""
+        if self.progressive:
+            self._present_progressive()
+            return
+
+        # Nada mudou desde o último frame rasterizado: só recompõe o framebuffer
+        if self._frame_key != self._last_key:
+            self._last_key = self._frame_key
+            self.framebuffer.clear()
+            self.flush()
+        self.framebuffer.present(self.viewport_x, self.viewport_y)
+
+    def _present_progressive(self):
+        """
+        Cena em movimento (assinatura diferente da do frame anterior): só a prévia
+        em baixa resolução é rasterizada. Cena parada: o framebuffer é refinado
+        em faixas de linhas e a prévia cobre as linhas que ainda faltam.
+        """
+        scale = self.preview_scale
+
+        if self._frame_key != self._last_key:
+            self._last_key = self._frame_key
+            self._refined_rows = 0
+            self.framebuffer.clear()
+            self._render_preview(self._take_triangles())
+        elif self._refined_rows < self.height:
+            self._refine(self._take_triangles())
+
+        if self._refined_rows < self.height:
+            self._preview.present(self.viewport_x, self.viewport_y, zoom=scale,
+                                  first_row=self._refined_rows // scale)
+        if self._refined_rows > 0:
+            self.framebuffer.present(self.viewport_x, self.viewport_y)
+
+    def _render_preview(self, triangles):
+        """Rasteriza os triângulos em 1/preview_scale da resolução, no framebuffer de prévia."""
+        scale = self.preview_scale
+        width = max(self.width // scale, 1)
+        height = max(self.height // scale, 1)
+        if self._preview is None or self._preview.gbuffer != self.deferred:
+            self._preview = SoftwareFramebuffer(width, height, gbuffer=self.deferred)
+        self._preview.resize(width, height)
+        self._preview.clear()
+
+        full, self.framebuffer = self.framebuffer, self._preview
+        try:
+            for p0, p1, p2, shading in triangles:
+                scaled = [dict(p, x=p['x'] / scale, y=p['y'] / scale) for p in (p0, p1, p2)]
+                self._rasterize_projected(*scaled, shading)
+            if self.deferred:
+                self.resolve()
+        finally:
+            self.framebuffer = full
+
+    def _refine(self, triangles):
+        """
+        Rasteriza faixas de linhas em resolução total até esgotar frame_budget_ms.
+        O refinamento é serial (scissor por faixa), mesmo no modo em tiles.
+        """
+        start = time.perf_counter()
+        # Faixas alinhadas aos pixels da prévia, que cobre as linhas acima delas
+        band = 4 * self.preview_scale
+
+        # Pelo menos uma faixa por frame, para o refinamento sempre avançar
+        while self._refined_rows < self.height:
+            y0 = self._refined_rows
+            y1 = min(y0 + band, self.height)
+            self.scissor = (0, y0, self.width, y1)
+            for triangle in triangles:
+                self._rasterize_projected(*triangle)
+            if self.deferred:
+                self.resolve(self.scissor)
+            self._refined_rows = y1
+            if (time.perf_counter() - start) * 1000.0 >= self.frame_budget_ms:
+                break
+        self.scissor = None
 
     """
     Rasterização manual (Scanline) com iluminação Phong por pixel.
-    Usa GL_POINTS para aproveitar o Z-Buffer do OpenGL.
+    Registra o objeto no frame; a projeção e a rasterização no framebuffer
+    em software acontecem em flush()/present(), só se algo mudou.
     """
     def render_object(self, obj, camera_pos, light_pos, light_colors):
 
@@ -22,85 +298,225 @@ class PhongManual:
         model_view = glGetDoublev(GL_MODELVIEW_MATRIX) 
         projection = glGetDoublev(GL_PROJECTION_MATRIX) 
         viewport = glGetIntegerv(GL_VIEWPORT) 
-        
-        
-        vertices = obj.vertices_3d
-        faces = obj.faces
 
-        glMatrixMode(GL_MODELVIEW)
-        glPushMatrix()
-        glLoadIdentity() 
-
-        glPointSize(1.7)
-        glDisable(GL_LIGHTING) 
+        self.submit_object(obj, model_view, projection, viewport, light_pos, light_colors)
+
+    def submit_object(self, obj, model_view, projection, viewport, light_pos, light_colors):
+        """
+        Como render_object, mas com matrizes (layout de glGetDoublev) e viewport
+        explícitos; não depende de um contexto OpenGL (renderização offline).
+        """
+        # O framebuffer cobre exatamente o viewport atual
+        self.viewport_x, self.viewport_y = int(viewport[0]), int(viewport[1])
+        if int(viewport[2]) != self.width or int(viewport[3]) != self.height:
+            self.update_size(viewport[2], viewport[3])
+            self.framebuffer.clear()
+
+        # A ModelView já inclui câmera e matriz do objeto; a versão cobre o material
+        self._frame_key.append((id(obj), obj.version, np.asarray(model_view).tobytes(),
+                                np.asarray(projection).tobytes(), tuple(viewport),
+                                tuple(light_pos), repr(light_colors)))
+        self._jobs.append((obj, model_view, projection, viewport, light_pos, light_colors))
+
+    def _project_object(self, obj, model_view, projection, viewport, light_pos, light_colors):
+        """
+        Estágio de projeção: todos os vértices do objeto são transformados uma
+        única vez (espaço do olho e da janela); os triângulos apenas indexam esses arrays.
+        """
+        # Malha indexada (ExtrudedObject: vértices soldados pelo MeshBuilder)
+        vertices, triangles = obj.mesh_arrays()
+        if len(triangles) == 0:
+            return
 
-        glEnable(GL_DEPTH_TEST) 
+        # Matrizes do OpenGL são column-major: com vetores-linha, P_eye = P_obj @ MV
+        mv = np.asarray(model_view, dtype=np.float64).reshape(4, 4)
+        proj = np.asarray(projection, dtype=np.float64).reshape(4, 4)
+        width, height = int(viewport[2]), int(viewport[3])
+
+        # ---- PROJETAR (uma multiplicação para todos os vértices) ---- #
+        eye = np.hstack((vertices, np.ones((len(vertices), 1)))) @ mv
+        window = self._eye_to_window(eye, proj, width, height)
+
+        # Normal de cada triângulo, rotacionada pela parte 3x3 da ModelView
+        v0, v1, v2 = vertices[triangles[:, 0]], vertices[triangles[:, 1]], vertices[triangles[:, 2]]
+        normals = normalize_rows(np.cross(v1 - v0, v2 - v0)) @ mv[:3, :3]
+
+        # ---- RECORTE NEAR ---- #
+        near = self._near_distance(proj)
+        inside = (-eye[:, 2] - near >= 0)[triangles]
+        whole = inside.all(axis=1)
+        crossing = inside.any(axis=1) & ~whole
+
+        # ---- BACK-FACE CULLING E VIEWPORT (triângulos inteiros, em lote) ---- #
+        xs = window[triangles, 0]
+        ys = window[triangles, 1]
+        keep = whole & ~((xs.max(axis=1) < 0) | (ys.max(axis=1) < 0) |
+                         (xs.min(axis=1) >= width) | (ys.min(axis=1) >= height))
+        if self.cull_back_faces:
+            # Área com sinal na janela (anti-horário = frente)
+            area = (xs[:, 1] - xs[:, 0]) * (ys[:, 2] - ys[:, 0]) - (xs[:, 2] - xs[:, 0]) * (ys[:, 1] - ys[:, 0])
+            keep &= area > 0
+
+        window_list = window.tolist()
+        eye_list = eye[:, :3].tolist()
+        normal_list = normals.tolist()
+        triangle_list = triangles.tolist()
+
+        # Todos os triângulos do objeto compartilham os mesmos parâmetros de sombreamento
+        shading = len(self._shading)
+        self._shading.append((light_pos, light_colors, obj.material))
+
+        for t in np.flatnonzero(keep).tolist():
+            n = normal_list[t]
+            a, b, c = triangle_list[t]
+            self._pending.append((projected_vertex(window_list[a], eye_list[a], n),
+                                  projected_vertex(window_list[b], eye_list[b], n),
+                                  projected_vertex(window_list[c], eye_list[c], n),
+                                  shading))
+
+        # Triângulos que cruzam o plano near são recortados no espaço do olho
+        for t in np.flatnonzero(crossing).tolist():
+            polygon = self._clip_near([eye_list[i] for i in triangle_list[t]], near)
+            self._queue_polygon(polygon, normal_list[t], proj, width, height, shading)
+
+    def _eye_to_window(self, eye, proj, width, height):
+        """Espaço do olho (N, 4) -> janela (N, 3): x, y relativos ao viewport e profundidade em [0, 1]."""
+        clip = eye @ proj
+        ndc = clip[:, :3] / clip[:, 3:4]
+        window = np.empty_like(ndc)
+        window[:, 0] = (ndc[:, 0] + 1.0) * 0.5 * width
+        window[:, 1] = (ndc[:, 1] + 1.0) * 0.5 * height
+        window[:, 2] = (ndc[:, 2] + 1.0) * 0.5
+        return window
+
+    def _queue_polygon(self, polygon, normal, proj, width, height, shading):
+        """Projeta um polígono convexo já recortado e enfileira seu leque de triângulos."""
+        if len(polygon) < 3:
+            return
 
-        glBegin(GL_POINTS)
+        eye = np.hstack((np.asarray(polygon, dtype=np.float64), np.ones((len(polygon), 1))))
+        window = self._eye_to_window(eye, proj, width, height).tolist()
+        projected = [projected_vertex(w, e, normal) for w, e in zip(window, polygon)]
 
-        
-        # Triangulação: Vamos usar apenas os triângulos dos objetos
-        for face in faces:
-            pivot = face[0] # Pivo: é o vértice principal para fazer a triangulação por leque
-            for i in range(1, len(face) - 1): # Iteramos sobre todos os vértices para tansformar a face em triângulos
-                indice_vertice1 = face[i] 
-                indice_vertice2 = face[i+1]
-                
-                triangle_vertex0 = vertices[pivot]
-                triangle_vertex1 = vertices[indice_vertice1]
-                triangle_vertex2 = vertices[indice_vertice2]
-                
-                # Rasteriza cada triângulo da face
-                self._rasterize_triangle(triangle_vertex0, triangle_vertex1, triangle_vertex2, model_view, projection, viewport, camera_pos, light_pos, light_colors, obj.material)
-        
-        glEnd()
+        # ---- BACK-FACE CULLING ---- #
+        # Área com sinal na janela: polígono plano, então vale para todo o leque
+        if self.cull_back_faces and self._signed_area(projected) <= 0:
+            return
 
-        glPopMatrix()
-        glMatrixMode(GL_MODELVIEW)
-        glEnable(GL_LIGHTING)
+        # ---- FORA DO VIEWPORT ---- #
+        xs = [p['x'] for p in projected]
+        ys = [p['y'] for p in projected]
+        if max(xs) < 0 or max(ys) < 0 or min(xs) >= width or min(ys) >= height:
+            return
 
-    # Auxiliar para interpolação linear entre dois dicionários de atributos
-    def interp(self, d1, d2, factor):
-        res = {}
-        for k in d1:
-            res[k] = d1[k] + (d2[k] - d1[k]) * factor
-        return res
+        for i in range(1, len(projected) - 1):
+            self._pending.append((projected[0], projected[i], projected[i + 1], shading))
+
+    def _signed_area(self, projected):
+        """Dobro da área com sinal (shoelace) do polígono projetado na janela."""
+        area = 0.0
+        count = len(projected)
+        for i in range(count):
+            a, b = projected[i], projected[(i + 1) % count]
+            area += a['x'] * b['y'] - b['x'] * a['y']
+        return area
+
+    def _near_distance(self, proj):
+        """Distância do plano near, extraída da matriz de projeção (perspectiva ou ortográfica)."""
+        if proj[2][3] == -1.0:
+            # Perspectiva: P[2][2] = -(f+n)/(f-n), P[3][2] = -2fn/(f-n)
+            return proj[3][2] / (proj[2][2] - 1.0)
+        # Ortográfica: P[2][2] = -2/(f-n), P[3][2] = -(f+n)/(f-n)
+        return (proj[3][2] + 1.0) / proj[2][2]
+
+    def _clip_near(self, polygon, near):
+        """Recorta o polígono (espaço do olho) contra o plano near: z_eye <= -near."""
+        # Distância com sinal ao plano near (>= 0 é visível)
+        dist = [-v[2] - near for v in polygon]
+        if min(dist) >= 0:
+            return polygon
+        if max(dist) < 0:
+            return []
+
+        # Sutherland-Hodgman com um único plano
+        clipped = []
+        count = len(polygon)
+        for i in range(count):
+            a, b = polygon[i], polygon[(i + 1) % count]
+            da, db = dist[i], dist[(i + 1) % count]
+            if da >= 0:
+                clipped.append(a)
+            if (da >= 0) != (db >= 0):
+                t = da / (da - db)
+                clipped.append([a[0] + (b[0] - a[0]) * t,
+                                a[1] + (b[1] - a[1]) * t,
+                                a[2] + (b[2] - a[2]) * t])
+        return clipped
 
     # Função que desenha uma linha horizontal (Span)
-    def draw_scanline(self, y, pa, pb, cam_pos, light_pos, light_colors, material, viewport):
+    # pa e pb são as arestas (ScanlineEdge) da esquerda e da direita, lidas direto na linha y
+    # shading é o índice dos parâmetros de sombreamento do objeto em self._shading
+    def draw_scanline(self, y, pa, pb, shading):
 
         # Ordenar da esquerda (pa) para direita (pb)
-        if pa['x'] > pb['x']: pa, pb = pb, pa
+        if pa.x > pb.x: pa, pb = pb, pa
 
         # Pegando valores para passar na linha do Y
-        x_start = int(math.floor(pa['x']))
-        x_end = int(math.floor(pb['x']))
+        x_start = int(math.floor(pa.x))
+        x_end = int(math.floor(pb.x))
         
-        dx = pb['x'] - pa['x']
+        dx = pb.x - pa.x
         if dx <= 0: 
             return
 
+        # Pixels fora do framebuffer (ou do scissor) não são escritos
+        fb = self.framebuffer
+        sx0, sy0, sx1, sy1 = self.scissor or (0, 0, fb.width, fb.height)
+        if y < sy0 or y >= sy1:
+            return
+        x_start = max(x_start, sx0)
+        x_end = min(x_end, sx1)
+
+        if self.deferred:
+            self._write_gbuffer_span(y, x_start, x_end, pa, pb, dx, shading)
+            return
+
+        light_pos, light_colors, material = self._shading[shading]
+
+        if self.vectorized:
+            self._draw_span_vectorized(y, x_start, x_end, pa, pb, dx, light_pos, light_colors, material)
+            return
+
+        depth_row = fb.depth[y]
+        color_row = fb.color[y]
+        terms = material_terms(material, light_colors)
+
         # Loop X (Span)
         for x in range(x_start, x_end):
             # Fator de interpolação horizontal 
             # x - x0 / x1 - x0 
-            factor = (x - pa['x']) / dx
+            factor = (x - pa.x) / dx
+
+            # Teste de profundidade antes de sombrear (Z-Buffer)
+            win_z = pa.win_z + (pb.win_z - pa.win_z) * factor
+            if win_z >= depth_row[x]:
+                continue
             
             # --- PHONG SHADING MANUAL  --- #
             
-            # Interpolando posição no espaço (para a luz e para o glVertex3f)
+            # Interpolando posição no espaço (para a luz)
             # y0 + (y1 - y0) * (x - x0 / x1 - x0 ) --> interpolação linear
             pos_eye = (
-                pa['wx'] + (pb['wx'] - pa['wx']) * factor,
-                pa['wy'] + (pb['wy'] - pa['wy']) * factor,
-                pa['wz'] + (pb['wz'] - pa['wz']) * factor
+                pa.wx + (pb.wx - pa.wx) * factor,
+                pa.wy + (pb.wy - pa.wy) * factor,
+                pa.wz + (pb.wz - pa.wz) * factor
             )
 
             # Interpolando Normal
             norm_eye = (
-                pa['nx'] + (pb['nx'] - pa['nx']) * factor,
-                pa['ny'] + (pb['ny'] - pa['ny']) * factor,
-                pa['nz'] + (pb['nz'] - pa['nz']) * factor
+                pa.nx + (pb.nx - pa.nx) * factor,
+                pa.ny + (pb.ny - pa.ny) * factor,
+                pa.nz + (pb.nz - pa.nz) * factor
             )
 
             norm_eye = normalize(norm_eye) # Renormalizar após interpolação
@@ -114,36 +530,31 @@ class PhongManual:
             L = normalize(sub(light_pos, pos_eye))
             
             # Cálculo da Cor (Phong)
-            
-            # Componente Ambiente
-            # Componente_Ambiente = Ia . Ka
 
-            # material.ambient = Ka 
-            # light_colors['amb'] = Ia 
-            amb = [material.ambient[i] * light_colors['amb'][i] for i in range(3)]
+            # Componente Ambiente
+            # Componente_Ambiente = Ia . Ka (pré-calculada em terms.ambient)
+            amb = terms.ambient
             
             # Componente Difusa (Lambert)
             # Componente_Difusa = I1 . Kd * cos(theta)
             
             # cos(theta) = Normal . Luz
-            # material.diffuse = Kd
-            # light_colors['dif'] = I1
+            # terms.diffuse = I1 . Kd
             NdotL = max(dot(norm_eye, L), 0.0)
-            diff = [material.diffuse[i] * light_colors['dif'][i] * NdotL for i in range(3)]
+            diff = [terms.diffuse[i] * NdotL for i in range(3)]
             
             # Componente Especular (Phong)
             # I1 . Ks . cos^n(alpha)
 
             # cos(alpha) = Reflection * Vetor para o olho/camera
-            # material.shininess = n
-            # material.specular = Ks  
-            # light_colors['spec'] = I1
+            # terms.shininess = n
+            # terms.specular = I1 . Ks
             spec = [0, 0, 0]
             if NdotL > 0.0:
                 # R = reflect(-L, N)
                 R = reflect(sub((0,0,0), L), norm_eye)
-                spec_val = pow(max(dot(R, V), 0.0), material.shininess) # Definindo intensidade de brilho
-                spec = [material.specular[i] * light_colors['spec'][i] * spec_val for i in range(3)]
+                spec_val = pow(max(dot(R, V), 0.0), terms.shininess) # Definindo intensidade de brilho
+                spec = [terms.specular[i] * spec_val for i in range(3)]
             
             # Cor final: I = ambiente + difusa + especular
             final_color = (
@@ -152,182 +563,152 @@ class PhongManual:
                 min(1.0, amb[2] + diff[2] + spec[2])
             )
             
-            # DESENHO E Z-BUFFER
-            glColor3f(*final_color)
+            # Escrita no framebuffer
+            color_row[x] = final_color
+            depth_row[x] = win_z
 
-            # Posição 3D interpolada.
-            # O OpenGL projeta ela novamente, calcula o Z e compara com o Depth Buffer existente.
-            glVertex3f(pos_eye[0], pos_eye[1], pos_eye[2])
+    def _draw_span_vectorized(self, y, x_start, x_end, pa, pb, dx, light_pos, light_colors, material):
+        """Mesmo cálculo de draw_scanline, mas para todos os pixels do span em arrays NumPy."""
+        if x_end <= x_start:
+            return
 
-    def project(self, v_obj, mv, normal, proj, vp):
-        """Projeta vértice para Tela (X,Y) e Espaço do Olho (3D)"""
-        x, y, z = v_obj
-        
-        # A função gluProject mapeia coordenadas de objeto para coordenadas de janela.
-        win_x, win_y, win_z = gluProject(x, y, z, mv, proj, vp)
-        
-        # Coordenadas do vértice vista pela câmera
-        # P_eye = ModelView * P_obj
-        camera_view_x = mv[0][0]*x + mv[1][0]*y + mv[2][0]*z + mv[3][0]
-        camera_view_y = mv[0][1]*x + mv[1][1]*y + mv[2][1]*z + mv[3][1]
-        camera_view_z = mv[0][2]*x + mv[1][2]*y + mv[2][2]*z + mv[3][2]
-
-        # Rotacionar normal - O Model View determina para onde estou "olhando"
-        ne_x = mv[0][0]*normal[0] + mv[1][0]*normal[1] + mv[2][0]*normal[2]
-        ne_y = mv[0][1]*normal[0] + mv[1][1]*normal[1] + mv[2][1]*normal[2]
-        ne_z = mv[0][2]*normal[0] + mv[1][2]*normal[1] + mv[2][2]*normal[2]
-        
-        return {
-            'x': win_x, 
-            'y': win_y,       
-            'win_z': win_z,       
-            'wx': camera_view_x, 
-            'wy': camera_view_y, 
-            'wz': camera_view_z, 
-            'nx': ne_x, 
-            'ny': ne_y, 
-            'nz': ne_z  
-        }
-
-    def _rasterize_triangle(self, v0, v1, v2, mv, proj, vp, cam_pos, l_pos, l_cols, material):
-
-        # ---- PROJETAR ---- #
-        tri_normal = normalize(cross(sub(v1, v0), sub(v2, v0))) 
-        p0 = self.project(v0, mv, tri_normal, proj, vp)
-        p1 = self.project(v1, mv, tri_normal, proj, vp)
-        p2 = self.project(v2, mv, tri_normal, proj, vp)
+        # Fator de interpolação horizontal de cada pixel do span
+        factor = (np.arange(x_start, x_end, dtype=np.float64) - pa.x) / dx
 
-        # ordenar por y
-        pts = sorted([p0, p1, p2], key=lambda p: p['y'])
+        # Teste de profundidade antes de sombrear (Z-Buffer)
+        depth_row = self.framebuffer.depth[y, x_start:x_end]
+        win_z = pa.win_z + (pb.win_z - pa.win_z) * factor
+        visible = win_z < depth_row
+        if not visible.any():
+            return
+        factor = factor[visible][:, None]
 
-        # criar ET (Edge Table) para o triângulo
-        ET = {}
+        pos_a = np.array((pa.wx, pa.wy, pa.wz))
+        pos_b = np.array((pb.wx, pb.wy, pb.wz))
+        norm_a = np.array((pa.nx, pa.ny, pa.nz))
+        norm_b = np.array((pb.nx, pb.ny, pb.nz))
 
-        # Função colocada dentro de rasterize para facilitar o uso do ET como var global dentro do contexto da func
-        def add_edge(pa, pb):
-            if pa['y'] == pb['y']:
-                return 
+        # Interpolação linear de posição e normal para o span inteiro
+        pos_eye = pos_a + (pos_b - pos_a) * factor
+        norm_eye = norm_a + (norm_b - norm_a) * factor
 
-            # assegurar que pa é o menor y
-            if pa['y'] > pb['y']:
-                pa, pb = pb, pa
+        colors = self.shade_vectorized(pos_eye, norm_eye, light_pos, light_colors, material)
 
-            dy = pb['y'] - pa['y']
-            if dy == 0:
-                return
+        # Escrita no framebuffer (apenas os pixels que passaram no teste)
+        self.framebuffer.color[y, x_start:x_end][visible] = colors
+        depth_row[visible] = win_z[visible]
 
-            edge = {
-                'ymax': pb['y'],
-                'x': pa['x'],
-                'dx': (pb['x'] - pa['x']) / dy,
+    def _write_gbuffer_span(self, y, x_start, x_end, pa, pb, dx, shading):
+        """Modo deferred: grava posição, normal e material dos pixels visíveis, sem iluminar."""
+        if x_end <= x_start:
+            return
 
-                'wx': pa['wx'],
-                'd_wx': (pb['wx'] - pa['wx']) / dy,
+        fb = self.framebuffer
+        factor = (np.arange(x_start, x_end, dtype=np.float64) - pa.x) / dx
 
-                'wy': pa['wy'],
-                'd_wy': (pb['wy'] - pa['wy']) / dy,
+        # Teste de profundidade: só o fragmento mais próximo fica no G-buffer
+        depth_row = fb.depth[y, x_start:x_end]
+        win_z = pa.win_z + (pb.win_z - pa.win_z) * factor
+        visible = win_z < depth_row
+        if not visible.any():
+            return
+        factor = factor[visible][:, None]
 
-                'wz': pa['wz'],
-                'd_wz': (pb['wz'] - pa['wz']) / dy,
+        pos_a = np.array((pa.wx, pa.wy, pa.wz))
+        pos_b = np.array((pb.wx, pb.wy, pb.wz))
+        norm_a = np.array((pa.nx, pa.ny, pa.nz))
+        norm_b = np.array((pb.nx, pb.ny, pb.nz))
 
-                'win_z': pa['win_z'],
-                'd_win_z': (pb['win_z'] - pa['win_z']) / dy,
+        depth_row[visible] = win_z[visible]
+        fb.position[y, x_start:x_end][visible] = pos_a + (pos_b - pos_a) * factor
+        fb.normal[y, x_start:x_end][visible] = norm_a + (norm_b - norm_a) * factor
+        fb.material[y, x_start:x_end][visible] = shading
 
-                'nx': pa['nx'],
-                'd_nx': (pb['nx'] - pa['nx']) / dy,
+    def shade_vectorized(self, pos_eye, norm_eye, light_pos, light_colors, material):
+        """Phong (ambiente + difusa + especular) para N fragmentos de uma vez. Retorna array (N, 3)."""
+        norm_eye = normalize_rows(norm_eye) # Renormalizar após interpolação
 
-                'ny': pa['ny'],
-                'd_ny': (pb['ny'] - pa['ny']) / dy,
+        # V (View) e L (Light), como em draw_scanline
+        V = normalize_rows(-pos_eye)
+        L = normalize_rows(np.asarray(light_pos[:3], dtype=np.float64) - pos_eye)
 
-                'nz': pa['nz'],
-                'd_nz': (pb['nz'] - pa['nz']) / dy,
-            }
+        terms = material_terms(material, light_colors)
 
-            y0 = int(pa['y'])
-            if y0 not in ET:
-                ET[y0] = []
-            ET[y0].append(edge)
+        # Componente Ambiente: Ia . Ka (constante no span)
+        amb = terms.ambient_rgb
 
-        # criar arestas do triângulo
-        add_edge(pts[0], pts[1])
-        add_edge(pts[1], pts[2])
-        add_edge(pts[0], pts[2])
+        # Componente Difusa: I1 . Kd * max(N . L, 0)
+        NdotL = np.maximum(dot_rows(norm_eye, L), 0.0)
+        diff = terms.diffuse_rgb * NdotL[:, None]
 
-        if not ET:
-            return
+        # Componente Especular: I1 . Ks . max(R . V, 0)^n, apenas onde N . L > 0
+        R = reflect_rows(-L, norm_eye)
+        RdotV = np.maximum(dot_rows(R, V), 0.0)
+        spec_val = np.where(NdotL > 0.0, RdotV ** terms.shininess, 0.0)
+        spec = terms.specular_rgb * spec_val[:, None]
 
-        # ---- AET - Active Edge Table ---- #
-        AET = []
+        # Cor final: I = ambiente + difusa + especular
+        return np.minimum(1.0, amb + diff + spec)
 
-        y = min(ET.keys())
-        y_max_global = int(max(p['y'] for p in pts))
+    def _rasterize_projected(self, p0, p1, p2, shading):
+        """Scanline de um triângulo já projetado, escrevendo no framebuffer."""
 
-        # ---- LOOP DE SCANLINE ---- #
-        while y <= y_max_global:
+        # ordenar por y
+        pts = sorted([p0, p1, p2], key=lambda p: p['y'])
 
-            # ativar arestas que começam neste y
-            if y in ET:
-                AET.extend(ET[y])
+        # ---- SCISSOR ---- #
+        fb = self.framebuffer
+        sx0, sy0, sx1, sy1 = self.scissor or (0, 0, fb.width, fb.height)
+        if (max(p['x'] for p in pts) < sx0 or min(p['x'] for p in pts) >= sx1
+                or pts[2]['y'] < sy0 or pts[0]['y'] >= sy1):
+            return
+
+        # criar ET (Edge Table) para o triângulo: arestas não horizontais, de baixo para cima
+        edges = [ScanlineEdge(pa, pb) for pa, pb in ((pts[0], pts[1]), (pts[1], pts[2]), (pts[0], pts[2]))
+                 if pa['y'] != pb['y']]
+
+        # Linhas fora do scissor não são percorridas: arestas que começam
+        # abaixo dele são avançadas direto até a primeira linha visível
+        for e in edges:
+            if e.y0 < sy0:
+                e.advance(sy0 - e.y0)
+                e.y0 = sy0
+        edges = [e for e in edges if e.y_last >= e.y0]
+        if not edges:
+            return
 
-            # remover arestas que terminam neste y
-            AET = [e for e in AET if e['ymax'] > y]
+        y_start = min(e.y0 for e in edges)
+        y_max_global = min(int(pts[2]['y']), sy1 - 1)
 
-            if len(AET) < 2:
+        # ---- LOOP DE SCANLINE ---- #
+        # A AET só muda quando uma aresta começa ou termina; entre esses
+        # eventos o conjunto ativo é fixo e as arestas são apenas avançadas.
+        events = sorted({y_start, y_max_global + 1}
+                        | {e.y0 for e in edges} | {e.y_last + 1 for e in edges})
+
+        for y_from, y_to in zip(events, events[1:]):
+            if y_from > y_max_global:
+                break
+            y_to = min(y_to, y_max_global + 1)
+
+            # AET - Active Edge Table neste intervalo de linhas
+            AET = [e for e in edges if e.y0 <= y_from <= e.y_last]
+
+            if len(AET) == 2:
+                # caso comum: um span entre as duas arestas (draw_scanline ordena por x)
+                a, b = AET
+                for y in range(y_from, y_to):
+                    self.draw_scanline(y, a, b, shading)
+                    a.step()
+                    b.step()
+            elif len(AET) > 2:
+                for y in range(y_from, y_to):
+                    left = min(AET, key=lambda e: e.x)
+                    right = max(AET, key=lambda e: e.x)
+                    self.draw_scanline(y, left, right, shading)
+                    for e in AET:
+                        e.step()
+            else:
                 # sem dois lados para formar um span
-                y += 1
-                # atualizar arestas
                 for e in AET:
-                    e['x'] += e['dx']
-                    e['wx'] += e['d_wx']
-                    e['wy'] += e['d_wy']
-                    e['wz'] += e['d_wz']
-                    e['win_z'] += e['d_win_z']
-                    e['nx'] += e['d_nx']
-                    e['ny'] += e['d_ny']
-                    e['nz'] += e['d_nz']
-                continue
-
-            # ordenar por X
-            AET.sort(key=lambda e: e['x'])
-
-            e1 = AET[0]
-            e2 = AET[-1]
-
-            # construir PA e PB (classe draw_scanline irá interpolar)
-            PA = {
-                'x': e1['x'],
-                'wx': e1['wx'],
-                'wy': e1['wy'],
-                'wz': e1['wz'],
-                'win_z': e1['win_z'],
-                'nx': e1['nx'],
-                'ny': e1['ny'],
-                'nz': e1['nz'],
-            }
-
-            PB = {
-                'x': e2['x'],
-                'wx': e2['wx'],
-                'wy': e2['wy'],
-                'wz': e2['wz'],
-                'win_z': e2['win_z'],
-                'nx': e2['nx'],
-                'ny': e2['ny'],
-                'nz': e2['nz'],
-            }
-
-            # print(y, PA, PB, cam_pos, l_pos, l_cols, material)
-            self.draw_scanline(y, PA, PB, cam_pos, l_pos, l_cols, material, vp)
-
-            # incrementar Y e atualizar atributos das arestas
-            y += 1
-
-            for e in AET:
-                e['x'] += e['dx']
-                e['wx'] += e['d_wx']
-                e['wy'] += e['d_wy']
-                e['wz'] += e['d_wz']
-                e['win_z'] += e['d_win_z']
-                e['nx'] += e['d_nx']
-                e['ny'] += e['d_ny']
-                e['nz'] += e['d_nz']
+                    e.advance(y_to - y_from)
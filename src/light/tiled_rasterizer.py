@@ -0,0 +1,118 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from light.framebuffer import SoftwareFramebuffer
+
+
+class TiledRasterizer:
+    """
+    Rasterização em tiles distribuída num pool de processos.
+
+    Os triângulos já projetados são agrupados (binning) pelos tiles de tela
+    que seu bounding box cobre. Cada processo rasteriza um conjunto de tiles
+    direto no framebuffer em memória compartilhada; como os tiles não se
+    sobrepõem, não há disputa de escrita entre processos.
+    """
+    def __init__(self, tile_size=64, workers=None):
+        self.tile_size = tile_size
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def bin_triangles(self, triangles, width, height):
+        """Retorna {(tile_x, tile_y): [índices dos triângulos que tocam o tile]}."""
+        size = self.tile_size
+        tiles_x = (width + size - 1) // size
+        tiles_y = (height + size - 1) // size
+        bins = {}
+
+        for index, triangle in enumerate(triangles):
+            p0, p1, p2 = triangle[:3]
+            xs = (p0['x'], p1['x'], p2['x'])
+            ys = (p0['y'], p1['y'], p2['y'])
+
+            tx0 = max(int(min(xs)) // size, 0)
+            tx1 = min(int(max(xs)) // size, tiles_x - 1)
+            ty0 = max(int(min(ys)) // size, 0)
+            ty1 = min(int(max(ys)) // size, tiles_y - 1)
+
+            for ty in range(ty0, ty1 + 1):
+                for tx in range(tx0, tx1 + 1):
+                    bins.setdefault((tx, ty), []).append(index)
+        return bins
+
+    def rasterize(self, triangles, shading, framebuffer, vectorized=True, deferred=False):
+        """
+        Rasteriza `triangles` no framebuffer compartilhado e aguarda todos os tiles.
+        `shading` é a lista de parâmetros de sombreamento indexada pelos triângulos;
+        no modo deferred cada processo também faz a passada de iluminação dos seus tiles.
+        """
+        if not triangles:
+            return
+
+        bins = self.bin_triangles(triangles, framebuffer.width, framebuffer.height)
+        if not bins:
+            return
+
+        # Tiles intercalados entre as tarefas para equilibrar a carga
+        # (o centro da tela costuma concentrar mais pixels cobertos)
+        task_count = min(len(bins), self.workers * 4)
+        groups = [[] for _ in range(task_count)]
+        for i, tile in enumerate(sorted(bins)):
+            groups[i % task_count].append(tile)
+
+        handles = framebuffer.shared_handles()
+        size = self.tile_size
+        tasks = []
+        for group in groups:
+            # Cada tarefa recebe apenas os triângulos que seus tiles usam
+            used = sorted({index for tile in group for index in bins[tile]})
+            local = {index: i for i, index in enumerate(used)}
+            tiles = []
+            for tx, ty in group:
+                rect = (tx * size, ty * size,
+                        min((tx + 1) * size, framebuffer.width),
+                        min((ty + 1) * size, framebuffer.height))
+                tiles.append((rect, [local[index] for index in bins[(tx, ty)]]))
+            tasks.append((handles, vectorized, deferred, shading,
+                          [triangles[index] for index in used], tiles))
+
+        # list() propaga exceções dos processos de trabalho
+        list(self._get_pool().map(_rasterize_tiles, tasks))
+
+
+# ---- Lado do processo de trabalho ---- #
+
+_worker_state = {'handles': None, 'renderer': None}
+
+def _rasterize_tiles(task):
+    handles, vectorized, deferred, shading, triangles, tiles = task
+
+    # Reaproveita o framebuffer anexado enquanto a memória compartilhada não muda
+    if _worker_state['handles'] != handles:
+        from light.phong_manual import PhongManual
+        if _worker_state['renderer'] is not None:
+            _worker_state['renderer'].framebuffer.release()
+        renderer = PhongManual(framebuffer=SoftwareFramebuffer.attach(handles))
+        _worker_state['handles'] = handles
+        _worker_state['renderer'] = renderer
+
+    renderer = _worker_state['renderer']
+    renderer.vectorized = vectorized
+    renderer.deferred = deferred
+    renderer._shading = shading
+
+    for rect, indices in tiles:
+        renderer.scissor = rect
+        for index in indices:
+            renderer._rasterize_projected(*triangles[index])
+        if deferred:
+            renderer.resolve(rect)
@@ -1,6 +1,8 @@
 from OpenGL.GL import *
 from OpenGL.GLU import *
 from OpenGL.GLUT import *
+import atexit
+import sys
 import imgui
 from imgui.integrations.opengl import ProgrammablePipelineRenderer 
 
@@ -12,6 +14,7 @@ from input_handlers import keyboard, mouse, motion
 from light.lighting_models import LightingController
 from light.shading_controller import ShadingController
 from light.phong_manual import PhongManual
+from batch_extrusion import extrude_file
 
 renderer = None
 camera = Camera()
@@ -97,6 +100,7 @@ def reshape(w, h):
     glLoadIdentity()
     
     imgui.get_io().display_size = w, h
+    phong_manual.update_size(w, h)
 
 def clear_scene():
     """Remove todos os objetos da lista global de objetos da cena."""
@@ -140,8 +144,15 @@ def display():
     # Início do frame do ImGui
     imgui.new_frame()
 
+    # Mão livre pode ser alternada pela tecla 'f' (editor) ou pelo painel
+    polygon_editor = polygon_modeler.polygon_editor
+    ui_state.polygon_freehand = polygon_editor.freehand
+
     # Chamada para a função de desenho do painel de controle com modelagem
     draw_control_panel(ui_state, add_object_to_scene, start_polygon_modeling, lighting_controller.enable_movable_light, clear_scene, lighting_controller.light_enabled)
+
+    polygon_editor.freehand = ui_state.polygon_freehand
+    polygon_editor.freehand_tolerance = ui_state.polygon_freehand_tolerance
     
     # Verificar se está em modo de modelagem
     if polygon_modeler.is_modeling_active():
@@ -176,6 +187,16 @@ def display():
         # Aplica o shader escolhido 
         shading_controller.apply_shading(ui_state.lightning_options[ui_state.lightning_selected_index], ui_state.phong_manual)
 
+        # Modos da rasterização manual e início do frame (o framebuffer só é limpo se a cena mudar)
+        if ui_state.phong_tiled != (phong_manual.tiled is not None):
+            phong_manual.enable_tiled(ui_state.phong_tiled)
+        if ui_state.phong_deferred != phong_manual.deferred:
+            phong_manual.enable_deferred(ui_state.phong_deferred)
+        if ui_state.phong_progressive != phong_manual.progressive:
+            phong_manual.enable_progressive(ui_state.phong_progressive)
+        phong_manual.frame_budget_ms = ui_state.phong_frame_budget_ms
+        phong_manual.begin_frame()
+
         # Desenha cada objeto
         for obj in objects:
             glPushMatrix()
@@ -210,6 +231,9 @@ def display():
 
             glPopMatrix()
 
+        # Compõe os objetos rasterizados manualmente sobre a cena (um upload por frame)
+        phong_manual.present()
+
 
     # --- Renderização do ImGui ---
     imgui.render()
@@ -251,8 +275,14 @@ def main():
     current_width = glutGet(GLUT_WINDOW_WIDTH)
     current_height = glutGet(GLUT_WINDOW_HEIGHT)
     phong_manual.update_size(current_width, current_height)
+    atexit.register(phong_manual.shutdown)
     reshape(current_width, current_height) 
 
+    # Arquivos .csv/.svg passados na linha de comando são extrudados em lote
+    for path in sys.argv[1:]:
+        for obj in extrude_file(path):
+            add_object_to_scene(obj)
+
     glutDisplayFunc(display)
     glutIdleFunc(display)
     glutMouseFunc(lambda b, s, x, y: mouse(b, s, x, y, polygon_modeler, objects, selected_objects, camera))
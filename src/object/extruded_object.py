@@ -1,9 +1,14 @@
 from OpenGL.GL import *
 from OpenGL.GLU import *
 from OpenGL.GLUT import *
-import math
+import numpy as np
 from object.object import Object
 from object.material import MATERIALS
+from object.mesh_builder import MeshBuilder
+from light.math_utils import normalize_rows
+from polygon_filling.assets.filling import iter_polygon_filling
+from polygon_filling.assets.spans import SpanSet
+from polygon_filling.assets.trapezoids import TRAPEZOID_DTYPE, polygon_trapezoids, trapezoid_triangles
 
 
 class ExtrudedObject(Object):
@@ -11,7 +16,8 @@ class ExtrudedObject(Object):
     # Objeto 3D criado por extrusão de um polígono 2D.
     
     
-    def __init__(self, base_vertices, depth, material='white_plastic', filled_segments=None):
+    def __init__(self, base_vertices, depth, material='white_plastic', filled_segments=None,
+                 cap_mode='triangulated', merge_spans=True, fill_density=40.0):
         """
         Cria objeto 3D por extrusão
         
@@ -19,16 +25,32 @@ class ExtrudedObject(Object):
             base_vertices: Lista de vértices 2D [[x,y,z], ...] que formam a base
             depth: Profundidade da extrusão (valor Z)
             material: Nome do material a ser aplicado
-            filled_segments: Lista de segmentos preenchidos [(y, x1, x2), ...] do algoritmo de filling
+            filled_segments: Segmentos preenchidos em pixels da tela (SpanSet ou lista [(y, x1, x2), ...]);
+                convertidos para o mundo com o tamanho atual da janela
+            cap_mode: 'triangulated' (tampas trianguladas direto da base, O(vértices))
+                ou 'scanline' (um quad por retângulo de preenchimento, O(linhas))
+            merge_spans: no modo 'scanline', junta segmentos de linhas seguidas cujas
+                pontas variam linearmente em trapézios (SpanSet.trapezoids)
+            fill_density: no modo 'scanline' sem filled_segments, linhas de preenchimento
+                por unidade do mundo; a base é preenchida em streaming no espaço do mundo,
+                então a malha não depende do tamanho da janela
         """
         # Inicializar classe pai
         super().__init__(shape='custom', material=material)
         
         self.base_vertices = base_vertices
         self.depth = depth
-        self.filled_segments = filled_segments
+        self.filled_segments = SpanSet.from_spans(filled_segments) if filled_segments is not None else None
+        self.cap_mode = cap_mode
+        self.merge_spans = merge_spans
+        self.fill_density = fill_density
         self.vertices_3d = []
         self.faces = []
+        # Malha indexada (MeshBuilder): vértices (n, 3), triângulos (m, 3) e normal de cada triângulo
+        self.vertex_array = np.empty((0, 3))
+        self.triangle_indices = np.empty((0, 3), dtype=np.intp)
+        self.triangle_normals = np.empty((0, 3))
+        self._mesh = None
         
         # Gerar geometria 3D 
         self._generate_geometry()
@@ -40,54 +62,118 @@ class ExtrudedObject(Object):
             print("Erro: Polígono base deve ter pelo menos 3 vértices")
             return
 
-        # Vértices frente e trás a partir da base (já no espaço do mundo)
-        self.vertices_3d = []
-        front_indices = []
-        back_indices = []
-        for vx, vy, *_ in self.base_vertices:
-            front_indices.append(len(self.vertices_3d))
-            self.vertices_3d.append([vx, vy, 0.0])
-        for vx, vy, *_ in self.base_vertices:
-            back_indices.append(len(self.vertices_3d))
-            self.vertices_3d.append([vx, vy, self.depth])
-
-        # Faces
-        self.faces = []
-        self.faces.append(front_indices)
-        back_face = back_indices[::-1]
-        self.faces.append(back_face)
-        for i in range(base_count):
-            j = (i + 1) % base_count
-            self.faces.append([front_indices[i], front_indices[j], back_indices[j], back_indices[i]])
+        # Faces frente e trás a partir da base (já no espaço do mundo), em ordem anti-horária
+        corners = [(vx, vy) for vx, vy, *_ in self.base_vertices]
+        if self._base_area() < 0:
+            corners.reverse()
+        self._add_caps(corners)
+        self._build_laterals_from_base()
     
     def _generate_geometry(self):
         """
         Geração unificada de geometria:
-        - Se houver filled_segments, gera faces frontal e traseira com base no filling
+        - cap_mode 'triangulated': faces frontal e traseira trianguladas a partir da base
+        - cap_mode 'scanline': faces frontal e traseira com base no filling
         - Caso contrário, usa a extrusão simples com polígono base
+        Os construtores alimentam um MeshBuilder: cantos coincidentes de faces
+        vizinhas viram um único vértice, e a malha sai com buffer de índices.
         """
-        if self.filled_segments:
-            print(f"Gerando extrusão com dados de preenchimento ({len(self.filled_segments)} segmentos)")
+        self._mesh = MeshBuilder()
+        if self.cap_mode == 'triangulated':
+            self._build_front_back_triangulated()
+            self._build_laterals_from_base()
+            print(f"Geometria com tampas trianguladas gerada: {len(self._mesh.vertices)} vértices, {len(self._mesh.faces)} faces")
+        elif self.cap_mode == 'scanline':
+            print("Gerando extrusão com dados de preenchimento")
             # Faces frontal e traseira guiadas por scanline
             self._build_front_back_from_fill()
             # Faces laterais: retângulos por aresta da base, com comprimento = profundidade
             self._build_laterals_from_base()
             # Não adicionar geometria interna: apenas planos que delimitam o objeto
-            print(f"Geometria com preenchimento (apenas planos) gerada: {len(self.vertices_3d)} vértices, {len(self.faces)} faces")
+            print(f"Geometria com preenchimento (apenas planos) gerada: {len(self._mesh.vertices)} vértices, {len(self._mesh.faces)} faces")
         else:
             print("Gerando extrusão simples sem dados de preenchimento")
             self._generate_3d_geometry()
+        self._finish_mesh()
+
+    def _finish_mesh(self):
+        """Publica a malha soldada: listas vertices_3d/faces e arrays indexados."""
+        mesh, self._mesh = self._mesh, None
+        self.vertices_3d = mesh.vertices
+        self.faces = mesh.faces
+        self.vertex_array = mesh.vertex_array()
+        self.triangle_indices = mesh.index_array()
+        v = self.vertex_array[self.triangle_indices]
+        self.triangle_normals = normalize_rows(np.cross(v[:, 1] - v[:, 0], v[:, 2] - v[:, 0]))
+        # Geometria nova (set_depth): o PhongManual não pode reaproveitar o frame anterior
+        self._touch()
+
+    def _base_area(self):
+        """Área com sinal da base no plano xy (positiva se anti-horária)."""
+        area = 0.0
+        count = len(self.base_vertices)
+        for i in range(count):
+            x0, y0, *_ = self.base_vertices[i]
+            x1, y1, *_ = self.base_vertices[(i + 1) % count]
+            area += x0 * y1 - x1 * y0
+        return area / 2.0
+
+    def _add_caps(self, corners):
+        """
+        Adiciona as tampas de um polígono anti-horário em xy: uma em z=0 e
+        outra em z=depth. As duas ficam com a normal para fora do sólido.
+        """
+        front = [(x, y, 0.0) for x, y in corners]
+        back = [(x, y, self.depth) for x, y in corners]
+        # Anti-horário em xy tem normal +z. Com depth > 0 o sólido fica acima de z=0,
+        # então a tampa de z=0 é invertida para a normal apontar para -z
+        if self.depth >= 0:
+            front.reverse()
+        else:
+            back.reverse()
+        self._mesh.add_face(front)
+        self._mesh.add_face(back)
+
+    def _build_front_back_triangulated(self):
+        """
+        Gera as faces frontal (z=0) e traseira (z=depth) triangulando a base
+        (trapézios par-ímpar, como o scanline: buracos continuam vazados).
+        O número de triângulos depende dos vértices, não da altura em pixels.
+        """
+        triangles = trapezoid_triangles(polygon_trapezoids(self.base_vertices))
+        # trapezoid_triangles sai anti-horário, qualquer que seja o sentido da base
+        for triangle in triangles.tolist():
+            self._add_caps(triangle)
 
     def _build_front_back_from_fill(self):
         """
         Gera as faces frontal (z=0) e traseira (z=depth) usando os segmentos
-        retornados por polygon_filling, construindo quads entre linhas y e y+1.
+        retornados por polygon_filling. Com merge_spans, segmentos de linhas
+        consecutivas com pontas alinhadas viram um único trapézio
+        (SpanSet.trapezoids); sem, segmentos iguais viram um único retângulo
+        (SpanSet.vertical_runs).
         """
-        self.vertices_3d = []
-        self.faces = []
+        scale_x, scale_y, offset_x, offset_y = self._fill_to_world()
 
+        # Trapézios em ordem de y; cada um vira um quad na frente e outro atrás
+        for trapezoids in self._iter_fill_trapezoids():
+            for y0, y1, xl0, xr0, xl1, xr1 in trapezoids.tolist():
+                # Cantos no sentido anti-horário; ponta de largura zero vira triângulo
+                corners = [(xl0, y0), (xr0, y0), (xr1, y1), (xl1, y1)]
+                if xr0 == xl0:
+                    del corners[1]
+                elif xr1 == xl1:
+                    del corners[3]
+                self._add_caps([(x * scale_x + offset_x, y * scale_y + offset_y) for x, y in corners])
+
+    def _fill_to_world(self):
+        """
+        Escala e deslocamento (sx, sy, ox, oy) das coordenadas do preenchimento
+        para o mundo: pixels da tela com filled_segments, senão amostras de
+        1 / fill_density unidades.
+        """
         if not self.filled_segments:
-            return
+            return 1.0 / self.fill_density, 1.0 / self.fill_density, 0.0, 0.0
 
         # Obter dimensão da janela atual para converter tela -> mundo
         # Preferir tamanho do ImGui (setado em reshape); evitar chamar glutGet sem GLUT
@@ -104,59 +190,31 @@ class ExtrudedObject(Object):
                 h = glutGet(GLUT_WINDOW_HEIGHT)
             except Exception:
                 w, h = 800, 600
-        # Usar mesma conversão de polygon_modeler._normalize_2d_to_3d para garantir alinhamento
-        def screen_to_world(x, y):
-            wx = ((x / w) - 0.5) * 10.0
-            wy = ((y / h) - 0.5) * 10.0
-            return wx, wy
-
-        # Agrupar por y e também preparar pares y -> y+1
-        by_y = {}
-        for y, x1, x2 in self.filled_segments:
-            by_y.setdefault(y, []).append((x1, x2))
+        # Mesma conversão de polygon_modeler._normalize_2d_to_3d: ((x / w) - 0.5) * 10
+        return 10.0 / w, 10.0 / h, -5.0, -5.0
 
-        sorted_ys = sorted(by_y.keys())
-
-        # Para cada par de linhas consecutivas, formar retângulos preenchidos
-        for i in range(len(sorted_ys) - 1):
-            y_curr = sorted_ys[i]
-            y_next = sorted_ys[i + 1]
-
-            # Converter Y de tela para mundo
-            _, world_y_curr = screen_to_world(0, y_curr)
-            _, world_y_next = screen_to_world(0, y_next)
-
-            # segmentos atuais e próximos (assumindo mesma estrutura de preenchimento)
-            segs_curr = sorted(by_y[y_curr], key=lambda s: s[0])
-            segs_next = sorted(by_y[y_next], key=lambda s: s[0])
-
-            # Estratégia simples: para cada segmento na linha atual, criar um quad "alto" de 1 linha
-            # Isso aproxima a área preenchida entre y e y+1.
-            for x1, x2 in segs_curr:
-                # Converter X de tela para mundo
-                world_x1, _ = screen_to_world(x1, 0)
-                world_x2, _ = screen_to_world(x2, 0)
-
-                # Vértices frente (z=0)
-                v0 = [world_x1, world_y_curr, 0.0]
-                v1 = [world_x2, world_y_curr, 0.0]
-                v2 = [world_x2, world_y_next, 0.0]
-                v3 = [world_x1, world_y_next, 0.0]
-
-                base_idx = len(self.vertices_3d)
-                self.vertices_3d.extend([v0, v1, v2, v3])
-                self.faces.append([base_idx, base_idx + 1, base_idx + 2, base_idx + 3])
-
-                # Vértices trás (z=depth)
-                b0 = [world_x1, world_y_curr, self.depth]
-                b1 = [world_x2, world_y_curr, self.depth]
-                b2 = [world_x2, world_y_next, self.depth]
-                b3 = [world_x1, world_y_next, self.depth]
+    def _iter_fill_trapezoids(self):
+        """
+        Faces do preenchimento (TRAPEZOID_DTYPE) por bloco de linhas, em ordem de y,
+        nas coordenadas de _fill_to_world. Sem filled_segments a base é preenchida
+        em blocos de iter_polygon_filling, sem manter o preenchimento inteiro em memória.
+        """
+        if self.filled_segments:
+            blocks = [self.filled_segments]
+        else:
+            samples = [[x * self.fill_density, y * self.fill_density] for x, y, *_ in self.base_vertices]
+            blocks = (SpanSet.from_spans(spans) for spans in iter_polygon_filling(samples))
 
-                back_idx = len(self.vertices_3d)
-                self.vertices_3d.extend([b0, b1, b2, b3])
-                # Inverter ordem para normal apontar para fora
-                self.faces.append([back_idx + 3, back_idx + 2, back_idx + 1, back_idx])
+        for spans in blocks:
+            if self.merge_spans:
+                yield spans.trapezoids()
+                continue
+            runs = spans.vertical_runs()
+            trapezoids = np.empty(len(runs), dtype=TRAPEZOID_DTYPE)
+            trapezoids['y0'], trapezoids['y1'] = runs['y_start'], runs['y_end']
+            trapezoids['xl0'] = trapezoids['xl1'] = runs['x1']
+            trapezoids['xr0'] = trapezoids['xr1'] = runs['x2']
+            yield trapezoids
 
     def _build_laterals_from_base(self):
         """
@@ -167,27 +225,20 @@ class ExtrudedObject(Object):
         if not self.base_vertices or len(self.base_vertices) < 2:
             return
 
-        # Construir vértices frente/trás a partir da base (já em espaço do mundo)
-        front_indices = []
-        back_indices = []
+        # Cantos frente/trás a partir da base (já em espaço do mundo); soldam com os das tampas
+        front = [(vx, vy, 0.0) for vx, vy, *_ in self.base_vertices]
+        back = [(vx, vy, self.depth) for vx, vy, *_ in self.base_vertices]
 
-        for vx, vy, *_ in self.base_vertices:
-            front_indices.append(len(self.vertices_3d))
-            self.vertices_3d.append([vx, vy, 0.0])
-        for vx, vy, *_ in self.base_vertices:
-            back_indices.append(len(self.vertices_3d))
-            self.vertices_3d.append([vx, vy, self.depth])
+        # [frente i, frente j, trás j, trás i] tem a normal à direita da aresta i -> j:
+        # para fora numa base anti-horária extrudada para +z; nos outros casos, invertido
+        outward = (self._base_area() > 0) == (self.depth >= 0)
 
-        base_count = len(front_indices)
+        base_count = len(front)
         # Para cada aresta do polígono base, criar retângulo lateral
         for i in range(base_count):
             j = (i + 1) % base_count
-            self.faces.append([
-                front_indices[i],
-                front_indices[j],
-                back_indices[j],
-                back_indices[i]
-            ])
+            face = [front[i], front[j], back[j], back[i]]
+            self._mesh.add_face(face if outward else face[::-1])
     
     def _add_filled_internal_geometry(self):
         """
@@ -259,58 +310,19 @@ class ExtrudedObject(Object):
             glPopMatrix()
     
     def _render_faces(self):
-        """Renderiza todas as faces do objeto"""
-        for face_indices in self.faces:
-            face_size = len(face_indices)
-            
-            if face_size == 3:
-                glBegin(GL_TRIANGLES)
-            elif face_size == 4:
-                glBegin(GL_QUADS)
-            else:
-                glBegin(GL_POLYGON)
-            
-            # Calcular normal da face para iluminação
-            if face_size >= 3:
-                normal = self._calculate_face_normal(face_indices)
-                glNormal3f(*normal)
-            
-            # Desenhar vértices da face
-            for vertex_index in face_indices:
-                vertex = self.vertices_3d[vertex_index]
-                glVertex3f(*vertex)
-            
-            glEnd()
-    
-    def _calculate_face_normal(self, face_indices):
-        """Calcula normal de uma face para iluminação"""
-        if len(face_indices) < 3:
-            return [0.0, 0.0, 1.0]  # Normal padrão
-        
-        # Pegar três primeiros vértices
-        v1 = self.vertices_3d[face_indices[0]]
-        v2 = self.vertices_3d[face_indices[1]]
-        v3 = self.vertices_3d[face_indices[2]]
-        
-        # Calcular vetores da face
-        edge1 = [v2[0] - v1[0], v2[1] - v1[1], v2[2] - v1[2]]
-        edge2 = [v3[0] - v1[0], v3[1] - v1[1], v3[2] - v1[2]]
-        
-        # Produto vetorial para normal
-        normal = [
-            edge1[1] * edge2[2] - edge1[2] * edge2[1],
-            edge1[2] * edge2[0] - edge1[0] * edge2[2],
-            edge1[0] * edge2[1] - edge1[1] * edge2[0]
-        ]
-        
-        # Normalizar
-        length = math.sqrt(normal[0]**2 + normal[1]**2 + normal[2]**2)
-        if length > 0:
-            normal = [normal[0]/length, normal[1]/length, normal[2]/length]
-        else:
-            normal = [0.0, 0.0, 1.0]
-        
-        return normal
+        """Renderiza os triângulos da malha indexada, com a normal de cada triângulo"""
+        vertices = self.vertex_array.tolist()
+        glBegin(GL_TRIANGLES)
+        for (a, b, c), normal in zip(self.triangle_indices.tolist(), self.triangle_normals.tolist()):
+            glNormal3f(*normal)
+            glVertex3f(*vertices[a])
+            glVertex3f(*vertices[b])
+            glVertex3f(*vertices[c])
+        glEnd()
+
+    def mesh_arrays(self):
+        """Vértices (n, 3) e triângulos (m, 3) da malha soldada (PhongManual, exportação)"""
+        return self.vertex_array, self.triangle_indices
     
     def set_depth(self, new_depth):
         """Altera a profundidade da extrusão"""
@@ -0,0 +1,97 @@
+import math
+import numpy as np
+
+
+def fan_triangles(faces):
+    """Triângulos (m, 3) em leque de cada face: o pivô face[0] com cada par de vértices seguintes."""
+    return np.array([(face[0], face[i], face[i + 1])
+                     for face in faces for i in range(1, len(face) - 1)], dtype=np.intp).reshape(-1, 3)
+
+
+class MeshBuilder:
+    """
+    Malha indexada com vértices soldados. Cada vértice novo cai numa célula
+    de um hash espacial; um vértice a até `tolerance` (em cada eixo) de outro
+    já inserido reaproveita o índice dele. Faces vizinhas passam a
+    compartilhar vértices, então a malha tem um vértice por posição em vez
+    de um por canto de face.
+    """
+    def __init__(self, tolerance=1e-6, cell_size=None):
+        self.tolerance = tolerance
+        # Células bem maiores que a tolerância: só pontos colados na borda consultam as vizinhas
+        self.cell_size = cell_size if cell_size is not None else tolerance * 64.0
+        self.vertices = []
+        self.faces = []
+        self.cells = {}
+        # Cantos idênticos (o caso comum: mesma conta nas duas faces) nem chegam ao hash espacial
+        self.exact = {}
+
+    def _axis_cells(self, value):
+        """Célula do valor num eixo e as vizinhas que ficam a até `tolerance` dele."""
+        scaled = value / self.cell_size
+        cell = math.floor(scaled)
+        near = (scaled - cell) * self.cell_size
+        cells = [cell]
+        if near <= self.tolerance:
+            cells.append(cell - 1)
+        if self.cell_size - near <= self.tolerance:
+            cells.append(cell + 1)
+        return cells
+
+    def add_vertex(self, x, y, z):
+        """Índice do vértice em (x, y, z), soldado a um existente quando coincidem."""
+        index = self.exact.get((x, y, z))
+        if index is not None:
+            return index
+
+        t = self.tolerance
+        xs, ys, zs = self._axis_cells(x), self._axis_cells(y), self._axis_cells(z)
+        for cx in xs:
+            for cy in ys:
+                for cz in zs:
+                    for index in self.cells.get((cx, cy, cz), ()):
+                        vx, vy, vz = self.vertices[index]
+                        if abs(vx - x) <= t and abs(vy - y) <= t and abs(vz - z) <= t:
+                            self.exact[(x, y, z)] = index
+                            return index
+
+        index = len(self.vertices)
+        self.vertices.append([x, y, z])
+        self.cells.setdefault((xs[0], ys[0], zs[0]), []).append(index)
+        self.exact[(x, y, z)] = index
+        return index
+
+    def add_face(self, points):
+        """
+        Adiciona a face pelos cantos [(x, y, z), ...] em ordem. Cantos
+        consecutivos soldados num só viram um; faces com menos de 3 vértices
+        distintos são descartadas. Retorna os índices da face (ou None).
+        """
+        face = []
+        for x, y, z in points:
+            index = self.add_vertex(x, y, z)
+            if not face or face[-1] != index:
+                face.append(index)
+        if len(face) > 1 and face[0] == face[-1]:
+            face.pop()
+        if len(face) < 3:
+            return None
+        self.faces.append(face)
+        return face
+
+    def vertex_array(self):
+        """Vértices soldados como array float64 (n, 3)."""
+        return np.asarray(self.vertices, dtype=np.float64).reshape(-1, 3)
+
+    def index_array(self):
+        """Buffer de índices: triângulos (m, 3) em leque de cada face."""
+        return fan_triangles(self.faces)
+
+
+def write_obj(path, vertices, faces):
+    """Grava a malha indexada no formato Wavefront OBJ (índices começam em 1)."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for x, y, z in vertices:
+            f.write(f"v {x:.9g} {y:.9g} {z:.9g}\n")
+        for face in faces:
+            f.write("f " + " ".join(str(i + 1) for i in face) + "\n")
@@ -3,7 +3,13 @@ from OpenGL.GLU import *
 from OpenGL.GLUT import *
 import math
 import copy
+import itertools
+import numpy as np
 from object.material import * 
+from object.mesh_builder import fan_triangles
+
+# Versões únicas entre todos os objetos: um objeto novo nunca repete a versão de outro
+_versions = itertools.count(1)
 
 def identity_matrix():
     return [
@@ -65,10 +71,16 @@ class Object:
 		self.material = copy.deepcopy(base_material)
 		
 		self.shading_model = shading_model
+		# Renovada a cada mudança de matriz, material ou geometria (cache do PhongManual)
+		self._touch()
 		# matriz modelo (column-major) cacheada
 		self._matrix = identity_matrix()
 		self._recompute_matrix()
 		
+	def _touch(self):
+		"""Renova a versão do objeto: o PhongManual não reaproveita frames com a versão antiga."""
+		self.version = next(_versions)
+
 	def _recompute_matrix(self):
 		"""Recalcula a matriz modelo combinando escala, rotações e translação.
 		Ordem escolhida: M = T * Rz * Ry * Rx * S
@@ -138,6 +150,7 @@ class Object:
 		M = mult(Rzm, M)
 		M = mult(T, M)
 		self._matrix = M
+		self._touch()
 	
 	def _apply_material(self):
 		"""
@@ -179,6 +192,10 @@ class Object:
 			glMaterialfv(GL_FRONT, GL_SPECULAR, self.material.specular)
 			glMaterialfv(GL_FRONT, GL_SHININESS, self.material.shininess)
 
+	def mesh_arrays(self):
+		"""Vértices (n, 3) e triângulos (m, 3) indexados da malha (leque de cada face)."""
+		return np.asarray(self.vertices_3d, dtype=np.float64).reshape(-1, 3), fan_triangles(self.faces)
+
 	def enable_manual_phong(self, enabled=True):
 		self.manual_phong = enabled
 
@@ -216,6 +233,7 @@ class Object:
 		"""Altera a cor do material ajustando componentes difusa e ambiente."""
 		self.material.diffuse = (r, g, b, 1.0)
 		self.material.ambient = (0.2*r, 0.2*g, 0.2*b, 1.0)
+		self._touch()
 
 	def set_material(self, material: str):
 		"""Define material por nome (string)."""
@@ -224,6 +242,7 @@ class Object:
 			raise ValueError(f"Material '{material}' não encontrado. Disponíveis: {list(MATERIALS.keys())}")
 		# Cria uma cópia do material para este objeto específico
 		self.material = copy.deepcopy(base_material)
+		self._touch()
 
 	def set_shading_mode(self, mode: str):
 		"""Altera modelo de sombreamento: 'flat' ou 'smooth'."""
@@ -0,0 +1,65 @@
+import math
+import numpy as np
+try:
+    from .filling import _spans_in_rows
+except ImportError:
+    from filling import _spans_in_rows
+
+
+class EdgeIndex:
+    """
+    Arestas não horizontais do polígono, guardadas pelo id do vértice inicial
+    no formato de _prepare_edges (primeira linha, linha final exclusiva, ymin,
+    xmin, 1/m) e indexadas em faixas de `bucket_rows` linhas. Trocar uma
+    aresta custa O(faixas que ela cobre); spans() de um intervalo de linhas
+    só visita as arestas das faixas desse intervalo.
+    """
+    def __init__(self, bucket_rows=32):
+        self.bucket_rows = bucket_rows
+        self.edges = {}
+        self.buckets = {}
+
+    def _buckets(self, first, last):
+        if last <= first:
+            return range(0)
+        return range(first // self.bucket_rows, (last - 1) // self.bucket_rows + 1)
+
+    def set(self, key, a, b):
+        """A aresta `key` passa a ligar os pontos a e b (substitui a anterior)."""
+        self.remove(key)
+        (ax, ay), (bx, by) = a[:2], b[:2]
+        if ay == by:
+            return
+        if ay > by:
+            (ax, ay), (bx, by) = (bx, by), (ax, ay)
+        first, last = math.ceil(ay), math.ceil(by)
+        self.edges[key] = (first, last, ay, ax, (bx - ax) / (by - ay))
+        for bucket in self._buckets(first, last):
+            self.buckets.setdefault(bucket, set()).add(key)
+
+    def remove(self, key):
+        edge = self.edges.pop(key, None)
+        if edge is None:
+            return
+        for bucket in self._buckets(edge[0], edge[1]):
+            keys = self.buckets[bucket]
+            keys.discard(key)
+            if not keys:
+                del self.buckets[bucket]
+
+    def clear(self):
+        self.edges.clear()
+        self.buckets.clear()
+
+    def spans(self, y_start, y_end):
+        """Spans (SPAN_DTYPE) das linhas y_start <= y < y_end, só com as arestas que as cruzam."""
+        keys = set()
+        for bucket in self._buckets(y_start, y_end):
+            keys.update(self.buckets.get(bucket, ()))
+        if not keys:
+            return _spans_in_rows(None, y_start, y_end)
+
+        records = np.array([self.edges[key] for key in keys], dtype=np.float64)
+        edges = (records[:, 0].astype(np.int64), records[:, 1].astype(np.int64),
+                 records[:, 2], records[:, 3], records[:, 4])
+        return _spans_in_rows(edges, y_start, y_end)
@@ -1,98 +1,123 @@
-def get_edges(vertex, adjacent):
-    
-    if vertex[1] >= adjacent[1]:
-        return None   
-    
-    xmax = adjacent[0]
-    ymax = adjacent[1]
-    xmin = vertex[0]
-    ymin = vertex[1]
-
-    inclination = 0 
-    if (xmax - xmin) != 0 and (ymax - ymin) != 0:
-        m = (ymax - ymin) / (xmax - xmin)
-        inclination = 1/m
-
-    return [ymax, xmin, inclination]
-    
-    
-
-def get_edges_list(polygon, index):
-
-    vertex = polygon[index]
-
-    # ultimo ponto
-    if index == len(polygon) - 1:
-        next = polygon[0]
-    else:
-        next = polygon[index + 1]
-
-    # primeiro ponto
-    if index == 0:
-        previous = polygon[len(polygon) - 1]
-    else:
-        previous = polygon[index - 1]
-
-    edges_list = []
-    if get_edges(vertex, next) != None:
-        edges_list.append(get_edges(vertex, next))
-    if get_edges(vertex, previous) != None:
-        edges_list.append(get_edges(vertex, previous))
-
-    return edges_list
-
-def polygon_filling(polygon):
-
-    if len(polygon) < 3:
-        return
-
-    ET = dict()
-    for i in range(len(polygon)):
-
-        edges = get_edges_list(polygon, i)
-        
-        if len(edges) != 0:
-            if polygon[i][1] in ET:
-                ET[polygon[i][1]] += edges
-            else:
-                ET[polygon[i][1]] = edges
-
-    if not ET:
+import numpy as np
+
+# Segmento de preenchimento: linha y, de x1 a x2 (inclusive)
+SPAN_DTYPE = np.dtype([('y', np.int32), ('x1', np.int32), ('x2', np.int32)])
+
+
+def _prepare_edges(polygon):
+    """
+    Arestas não horizontais orientadas de baixo para cima, como arrays:
+    (primeira linha, linha final exclusiva, ymin, xmin, 1/m). None se não houver.
+    """
+    vertices = np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+    if len(vertices) < 3:
+        return None
+
+    a = vertices
+    b = np.roll(vertices, -1, axis=0)
+    keep = a[:, 1] != b[:, 1]
+    a, b = a[keep], b[keep]
+    if len(a) == 0:
+        return None
+    flip = a[:, 1] > b[:, 1]
+    lower = np.where(flip[:, None], b, a)
+    upper = np.where(flip[:, None], a, b)
+
+    ymin, xmin = lower[:, 1], lower[:, 0]
+    inclination = (upper[:, 0] - xmin) / (upper[:, 1] - ymin)
+
+    # Linhas inteiras de cada aresta: [first, last)
+    first = np.ceil(ymin).astype(np.int64)
+    last = np.ceil(upper[:, 1]).astype(np.int64)
+    return first, last, ymin, xmin, inclination
+
+
+def _spans_in_rows(edges, y_start, y_end):
+    """Spans das linhas y_start <= y < y_end (None = sem limite) a partir de _prepare_edges."""
+    if edges is None:
+        return np.empty(0, dtype=SPAN_DTYPE)
+    first, last, ymin, xmin, inclination = edges
+
+    if y_start is not None:
+        first = np.maximum(first, y_start)
+    if y_end is not None:
+        last = np.minimum(last, y_end)
+    counts = np.maximum(last - first, 0)
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=SPAN_DTYPE)
+
+    # Um cruzamento por (aresta, linha)
+    edge = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    rows = first[edge] + offsets
+    xs = xmin[edge] + (rows - ymin[edge]) * inclination[edge]
+
+    order = np.lexsort((xs, rows))
+    rows, xs = rows[order], xs[order]
+
+    # Posição de cada cruzamento dentro da sua linha: pares (0,1), (2,3), ...
+    row_start = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+    row_size = np.diff(np.r_[row_start, total])
+    position = np.arange(total) - np.repeat(row_start, row_size)
+    left = np.flatnonzero(position % 2 == 0)
+    # Cruzamento sem par (último ímpar da linha) é descartado
+    left = left[(left + 1 < total)]
+    left = left[rows[left + 1] == rows[left]]
+
+    spans = np.empty(len(left), dtype=SPAN_DTYPE)
+    spans['y'] = rows[left]
+    spans['x1'] = np.round(xs[left])
+    spans['x2'] = np.round(xs[left + 1])
+    return spans
+
+
+def polygon_filling_spans(polygon, y_start=None, y_end=None):
+    """
+    Scanline par-ímpar em lote com NumPy. Retorna um array estruturado
+    (SPAN_DTYPE) ordenado por y e x.
+
+    Cada aresta não horizontal fica ativa nas linhas ymin <= y < ymax e seu x
+    é avaliado direto na linha (xmin + (y - ymin) / m). Todos os cruzamentos
+    aresta/linha são gerados de uma vez, ordenados por (y, x) e agrupados em
+    pares dentro de cada linha. y_start/y_end limitam as linhas calculadas.
+    """
+    return _spans_in_rows(_prepare_edges(polygon), y_start, y_end)
+
+
+def iter_polygon_filling(polygon, block_rows=4096):
+    """
+    Versão em streaming de polygon_filling_spans: gera um array de spans por
+    bloco de block_rows linhas, em ordem de y. A memória fica limitada aos
+    cruzamentos de um bloco, mesmo para polígonos com dezenas de milhares de linhas.
+    """
+    edges = _prepare_edges(polygon)
+    if edges is None:
         return
 
-    filled_segments = []
-    y = min(ET.keys())      
-    AET = []               
+    # Arestas em ordem de início: cada bloco só considera as que já começaram e não terminaram
+    order = np.argsort(edges[0], kind='stable')
+    edges = tuple(array[order] for array in edges)
+    first, last = edges[0], edges[1]
+    y_end = int(last.max())
 
-    while ET or AET:
+    for y_start in range(int(first[0]), y_end, block_rows):
+        block_end = min(y_start + block_rows, y_end)
+        started = int(np.searchsorted(first, block_end, side='left'))
+        active = np.flatnonzero(last[:started] > y_start)
+        if len(active) == 0:
+            continue
+        spans = _spans_in_rows(tuple(array[active] for array in edges), y_start, block_end)
+        if len(spans):
+            yield spans
 
-        # remove arestas de ET e adiciona em AET 
-        if y in ET:
-            AET.extend(ET.pop(y))
 
-        # mantém AET ordenada por x
-        AET.sort(key=lambda e: e[1])
-
-        # remore arestas já concluidas de AET quando o ymax passou
-        AET = [edge for edge in AET if edge[0] > y]
-
-        # desenhar linha de varredura
-        for i in range(0, len(AET), 2):
-            if i + 1 < len(AET):
-                x1 = round(AET[i][1])
-                x2 = round(AET[i + 1][1])
-                
-                # desenha linha
-                filled_segments.append((y, x1, x2))
-
-        # incrementa y
-        y += 1
-
-        # atualiza x das arestas remanescentes
-        for edge in AET:
-            edge[1] += edge[2]  # x = x + 1/m
+def polygon_filling(polygon):
+    """Segmentos [(y, x1, x2), ...] do polígono inteiro (interface em listas de tuplas)."""
+    if len(polygon) < 3:
+        return
 
-        # reordena AET por x
-        AET.sort(key=lambda e: e[1])
-    
-    return filled_segments
+    spans = polygon_filling_spans(polygon)
+    if len(spans) == 0:
+        return
+    return spans.tolist()
@@ -0,0 +1,175 @@
+import heapq
+
+
+def _orientation(a, b, c):
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def _on_segment(a, b, p):
+    """p (colinear com a-b) está dentro da caixa do segmento."""
+    return min(a[0], b[0]) <= p[0] <= max(a[0], b[0]) and min(a[1], b[1]) <= p[1] <= max(a[1], b[1])
+
+
+def segment_intersection(p1, p2, q1, q2):
+    """
+    Ponto de interseção dos segmentos p1-p2 e q1-q2, ou None. Se eles só se
+    tocam ou se sobrepõem (colineares), retorna o menor ponto (x, y) em comum.
+    """
+    d1 = _orientation(q1, q2, p1)
+    d2 = _orientation(q1, q2, p2)
+    d3 = _orientation(p1, p2, q1)
+    d4 = _orientation(p1, p2, q2)
+
+    if ((d1 > 0 > d2) or (d1 < 0 < d2)) and ((d3 > 0 > d4) or (d3 < 0 < d4)):
+        t = d1 / (d1 - d2)
+        return (p1[0] + t * (p2[0] - p1[0]), p1[1] + t * (p2[1] - p1[1]))
+
+    touching = []
+    if d1 == 0 and _on_segment(q1, q2, p1):
+        touching.append(p1)
+    if d2 == 0 and _on_segment(q1, q2, p2):
+        touching.append(p2)
+    if d3 == 0 and _on_segment(p1, p2, q1):
+        touching.append(q1)
+    if d4 == 0 and _on_segment(p1, p2, q2):
+        touching.append(q2)
+    return min(touching) if touching else None
+
+
+def find_self_intersections(polygon):
+    """
+    Pares de arestas (i, j), i < j, do polígono fechado que se cruzam ou se
+    tocam. A aresta i liga os vértices i e i + 1. Arestas vizinhas só contam
+    se voltarem uma sobre a outra (sobreposição além do vértice comum).
+
+    Varredura de Bentley–Ottmann: uma linha vertical percorre os eventos
+    (extremidades e cruzamentos) em ordem de (x, y), mantendo as arestas que
+    ela corta ordenadas por y. Só arestas vizinhas nessa ordem são testadas,
+    e cada evento acha sua posição por busca binária: O((n + k) log n)
+    comparações para k interseções. A ordem da varredura fica numa lista
+    simples, então inserir e remover movem O(n) referências por evento e o
+    pior caso é O((n + k) n). Esse termo é só um memmove; com 20 mil vértices
+    a varredura toda leva ~0,3 s.
+    """
+    points = [(float(v[0]), float(v[1])) for v in polygon]
+    n = len(points)
+    if n < 3:
+        return []
+
+    # Arestas não degeneradas, com a extremidade esquerda (menor (x, y)) primeiro
+    edges = {}
+    cyclic = []
+    for i in range(n):
+        a, b = points[i], points[(i + 1) % n]
+        if a == b:
+            continue
+        edges[i] = (a, b) if a < b else (b, a)
+        cyclic.append(i)
+    if len(cyclic) < 2:
+        return []
+    # Vizinhas no contorno (pulando arestas de comprimento zero)
+    adjacent = {frozenset((cyclic[k], cyclic[(k + 1) % len(cyclic)])) for k in range(len(cyclic))}
+
+    scale = max(max(abs(x), abs(y)) for x, y in points)
+    eps = 1e-9 * max(1.0, scale)
+
+    found = set()
+    events = []
+    starts = {}
+    for i, (left, right) in edges.items():
+        starts.setdefault(left, []).append(i)
+        events.append(left)
+        events.append(right)
+    heapq.heapify(events)
+    scheduled = set(events)
+
+    def y_at(i, px, py):
+        (ax, ay), (bx, by) = edges[i]
+        if ax == bx:
+            # Aresta vertical: no x dela, vale o y do evento (limitado ao segmento)
+            return min(max(py, ay), by)
+        return ay + (px - ax) * (by - ay) / (bx - ax)
+
+    def slope_after(i, px, py):
+        bx, by = edges[i][1]
+        return (by - py) / (bx - px) if bx != px else float('inf')
+
+    def report(i, j):
+        found.add((i, j) if i < j else (j, i))
+
+    def folds_back(i, j):
+        """Arestas vizinhas colineares que voltam uma sobre a outra."""
+        (a1, a2), (b1, b2) = edges[i], edges[j]
+        shared = a1 if a1 in (b1, b2) else a2
+        other_a = a2 if shared == a1 else a1
+        other_b = b2 if shared == b1 else b1
+        return _orientation(shared, other_a, other_b) == 0 and \
+            (other_a[0] - shared[0]) * (other_b[0] - shared[0]) + (other_a[1] - shared[1]) * (other_b[1] - shared[1]) > 0
+
+    def check(i, j):
+        """Registra o par que se encontra num mesmo ponto (vizinhas só se voltarem)."""
+        if frozenset((i, j)) not in adjacent or folds_back(i, j):
+            report(i, j)
+
+    def test(i, j, p):
+        (a1, a2), (b1, b2) = edges[i], edges[j]
+        if frozenset((i, j)) in adjacent:
+            # Vértice comum não conta
+            if folds_back(i, j):
+                report(i, j)
+            return
+        point = segment_intersection(a1, a2, b1, b2)
+        if point is None:
+            return
+        report(i, j)
+        if point > p and point not in scheduled:
+            scheduled.add(point)
+            heapq.heappush(events, point)
+
+    def bisect(status, px, py, threshold, inclusive):
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            y = y_at(status[mid], px, py)
+            if y < threshold or (inclusive and y == threshold):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    status = []
+    previous = None
+    while events:
+        p = heapq.heappop(events)
+        if p == previous:
+            continue
+        previous = p
+        px, py = p
+
+        # Arestas da varredura que passam por p (terminam ou cruzam aqui)
+        lo = bisect(status, px, py, py - eps, False)
+        hi = bisect(status, px, py, py + eps, True)
+        through = status[lo:hi]
+        beginning = starts.get(p, [])
+
+        involved = through + beginning
+        for a in range(len(involved)):
+            for b in range(a + 1, len(involved)):
+                check(involved[a], involved[b])
+
+        # As que continuam depois de p trocam de ordem: ficam ordenadas pela inclinação
+        continuing = [i for i in through if edges[i][1] != p] + beginning
+        continuing.sort(key=lambda i: slope_after(i, px, py))
+        status[lo:hi] = continuing
+
+        if not continuing:
+            if 0 < lo < len(status):
+                test(status[lo - 1], status[lo], p)
+        else:
+            if lo > 0:
+                test(status[lo - 1], continuing[0], p)
+            after = lo + len(continuing)
+            if after < len(status):
+                test(continuing[-1], status[after], p)
+
+    return sorted(found)
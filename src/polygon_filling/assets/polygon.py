@@ -1,8 +1,19 @@
 from OpenGL.GL import *
 try:
-    from .filling import polygon_filling
+    from .filling import iter_polygon_filling
+    from .edge_index import EdgeIndex
+    from .spans import SpanSet
+    from .vertex_buffer import VertexBuffer, runs_to_triangles, edges_to_triangles
+    from .intersections import find_self_intersections
+    from .vertex_grid import VertexGrid
 except ImportError:
-    from filling import polygon_filling
+    from filling import iter_polygon_filling
+    from edge_index import EdgeIndex
+    from spans import SpanSet
+    from vertex_buffer import VertexBuffer, runs_to_triangles, edges_to_triangles
+    from intersections import find_self_intersections
+    from vertex_grid import VertexGrid
+import numpy as np
 import math
 
 
@@ -12,46 +23,171 @@ class Polygon():
     def __init__(self, color=(1.0, 1.0, 1.0)):
         self.vertices = []
         self.color = color
-        self.filled_segments = []
+        # Segmentos (y, x1, x2) em arrays int32 indexados por linha
+        self.filled_segments = SpanSet()
+        # Preenchimento incremental: intervalos de linhas [y0, y1) afetados por
+        # edições desde o último fill(); só essas linhas são recalculadas
+        self._dirty_rows = []
+        # Arestas mantidas a cada edição e indexadas por linhas: o fill() de um
+        # intervalo só visita as arestas que o cruzam
+        self.edge_index = EdgeIndex()
+        # Muda a cada edição dos vértices; os VBOs guardam a revisão que enviaram
+        self._revision = 0
+        # Pares de arestas que se cruzam e a revisão em que foram calculados
+        self._intersections = (None, [])
+        self._fill_buffer = VertexBuffer()
+        self._edge_buffer = VertexBuffer()
+        # Ids estáveis dos vértices (paralelos a vertices) e índice espacial por id
+        self._vertex_ids = []
+        # id -> posição em vertices, para o achado da grade virar índice em O(1)
+        self._vertex_index = {}
+        self._next_vertex_id = 0
+        self.vertex_grid = VertexGrid()
     
     def fill(self, color=(0.5, 0.5, 1.0)):
-        """Calcula segmentos de preenchimento via scanline e define cor."""
+        """Atualiza os segmentos de preenchimento (scanline) das linhas alteradas e define cor."""
+        self.color = color
         if len(self.vertices) < 3:
-            self.filled_segments = []
+            # As linhas marcadas continuam pendentes até haver um polígono
+            self.filled_segments = SpanSet()
             return
-            
+        if not self._dirty_rows:
+            return
+
         try:
-            self.filled_segments = polygon_filling(self.vertices)
-            self.color = color
-            
+            for y_start, y_end in self._merge_rows(self._dirty_rows):
+                # Troca só as linhas alteradas
+                self.filled_segments.splice(y_start, y_end, self.edge_index.spans(y_start, y_end))
+            self._dirty_rows = []
+
             if self.filled_segments:
                 print(f"Polígono preenchido: {len(self.filled_segments)} segmentos")
-                
                 # Buracos: múltiplos segmentos na mesma linha Y
-                y_lines = {}
-                for y, x1, x2 in self.filled_segments:
-                    if y not in y_lines:
-                        y_lines[y] = 0
-                    y_lines[y] += 1
-                
-                holes = sum(1 for count in y_lines.values() if count > 1)
-                if holes > 0:
-                    print(f"  → Detectados buracos em {holes} linhas")
+                hole_rows = self.filled_segments.hole_rows()
+                if hole_rows > 0:
+                    print(f"  → Detectados buracos em {hole_rows} linhas")
                 else:
                     print("  → Polígono sólido (sem buracos)")
             else:
                 print("Aviso: Nenhum segmento gerado pelo algoritmo de preenchimento")
-                
+
         except Exception as e:
             print(f"Erro no preenchimento: {e}")
-            self.filled_segments = []
+            self._reset_fill()
+
+    def _reset_fill(self):
+        """Descarta o preenchimento; o próximo fill() recalcula o polígono inteiro."""
+        self.filled_segments = SpanSet()
+        self._dirty_rows = []
+        self._revision += 1
+        if self.vertices:
+            ys = [v[1] for v in self.vertices]
+            self._mark_rows(min(ys), max(ys))
+
+    def _mark_rows(self, y_a, y_b):
+        """Marca as linhas em que uma aresta de y_a a y_b fica ativa (ymin <= y < ymax)."""
+        y_start = math.floor(min(y_a, y_b))
+        y_end = math.ceil(max(y_a, y_b))
+        if y_end > y_start:
+            self._dirty_rows.append((y_start, y_end))
+
+    def _mark_edge(self, a, b):
+        self._mark_rows(a[1], b[1])
+
+    def _set_edge(self, index):
+        """Atualiza no índice de arestas a aresta que sai do vértice `index`."""
+        n = len(self.vertices)
+        if n == 0:
+            return
+        index %= n
+        self.edge_index.set(self._vertex_ids[index], self.vertices[index], self.vertices[(index + 1) % n])
+
+    @staticmethod
+    def _merge_rows(ranges):
+        merged = []
+        for y_start, y_end in sorted(ranges):
+            if merged and y_start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], y_end)
+            else:
+                merged.append([y_start, y_end])
+        return merged
 
     def add_vertex(self, x, y):
         """Adiciona vértice (x,y) à lista de vértices na ordem atual."""
-        self.vertices.append([x, y])
+        vertex = [x, y]
+        if self.vertices:
+            first, last = self.vertices[0], self.vertices[-1]
+            # A aresta de fechamento (last -> first) dá lugar a last -> novo -> first
+            self._mark_edge(last, first)
+            self._mark_edge(last, vertex)
+            self._mark_edge(vertex, first)
+        self.vertices.append(vertex)
+        self._vertex_ids.append(self._next_vertex_id)
+        self._vertex_index[self._next_vertex_id] = len(self.vertices) - 1
+        self.vertex_grid.insert(self._next_vertex_id, x, y)
+        self._next_vertex_id += 1
+        # last -> novo (no lugar da aresta de fechamento) e novo -> first
+        self._set_edge(len(self.vertices) - 2)
+        self._set_edge(len(self.vertices) - 1)
+        self._revision += 1
+
+    def find_vertex(self, x, y, radius=8.0):
+        """Índice do vértice mais próximo de (x, y) a até `radius` pixels, ou None."""
+        vertex_id = self.vertex_grid.nearest(x, y, radius)
+        return None if vertex_id is None else self._vertex_index[vertex_id]
+
+    def _neighbours(self, index):
+        n = len(self.vertices)
+        return self.vertices[(index - 1) % n], self.vertices[(index + 1) % n]
+
+    def move_vertex(self, index, x, y):
+        """Move o vértice `index`; só as linhas das duas arestas dele (antes e depois) são recalculadas."""
+        vertex = self.vertices[index]
+        if len(self.vertices) > 1:
+            previous, following = self._neighbours(index)
+            self._mark_edge(previous, vertex)
+            self._mark_edge(vertex, following)
+            self._mark_edge(previous, [x, y])
+            self._mark_edge([x, y], following)
+        self.vertices[index] = [x, y]
+        self.vertex_grid.move(self._vertex_ids[index], x, y)
+        self._set_edge(index - 1)
+        self._set_edge(index)
+        self._revision += 1
+
+    def remove_vertex(self, index):
+        """Remove o vértice `index`; as arestas vizinhas dão lugar a uma só (anterior -> seguinte)."""
+        vertex = self.vertices[index]
+        if len(self.vertices) > 1:
+            previous, following = self._neighbours(index)
+            self._mark_edge(previous, vertex)
+            self._mark_edge(vertex, following)
+            self._mark_edge(previous, following)
+        del self.vertices[index]
+        vertex_id = self._vertex_ids.pop(index)
+        del self._vertex_index[vertex_id]
+        # O del já é O(n): os vértices seguintes recuam uma posição
+        for position in range(index, len(self._vertex_ids)):
+            self._vertex_index[self._vertex_ids[position]] = position
+        self.vertex_grid.remove(vertex_id)
+        self.edge_index.remove(vertex_id)
+        self._set_edge(index - 1)
+        self._revision += 1
 
     def clear(self):
         self.vertices.clear()
+        self.filled_segments = SpanSet()
+        self._dirty_rows = []
+        self._vertex_ids.clear()
+        self._vertex_index.clear()
+        self.vertex_grid.clear()
+        self.edge_index.clear()
+        self._revision += 1
+
+    def release(self):
+        """Apaga os VBOs de preenchimento e arestas (chamar com o contexto de GL ativo)."""
+        self._fill_buffer.release()
+        self._edge_buffer.release()
     
     def _are_collinear(self, p1, p2, p3):
         """Testa colinearidade via produto vetorial ≈ 0 (tolerância)."""
@@ -74,70 +210,72 @@ class Polygon():
                 return True
         return False
     
+    def find_self_intersections(self):
+        """
+        Pares (i, j) de arestas que se cruzam ou se tocam; a aresta i vai do
+        vértice i ao i+1. A varredura roda uma vez por revisão dos vértices:
+        is_valid_for_extrusion() e quem relata o erro em seguida a compartilham.
+        """
+        revision, pairs = self._intersections
+        if revision != self._revision:
+            pairs = find_self_intersections(self.vertices)
+            self._intersections = (self._revision, pairs)
+        return list(pairs)
+
     def is_valid_for_extrusion(self):
-        """Valida extrusão: ≥3 vértices e sem colinearidade consecutiva."""
+        """Valida extrusão: ≥3 vértices, sem colinearidade consecutiva e sem auto-interseção."""
         if len(self.vertices) < 3:
             return False
         
         # Verifica se há pontos colineares
         if self._has_collinear_points():
             return False
+
+        # Verifica se alguma aresta cruza outra
+        if self.find_self_intersections():
+            return False
             
         return True
 
     def draw_edges(self, current_line_thickness):
-        """Desenha arestas como retângulos de espessura `current_line_thickness`."""
+        """
+        Desenha arestas como retângulos de espessura `current_line_thickness`.
+        Os retângulos vão para um VBO só quando os vértices ou a espessura mudam.
+        """
         if len(self.vertices) < 2:
             return
         
         glColor3f(1.0, 1.0, 1.0)
 
-        half_w = current_line_thickness / 2.0
+        key = (self._revision, current_line_thickness)
+        if self._edge_buffer.key != key:
+            self._edge_buffer.upload(edges_to_triangles(self.vertices, current_line_thickness), key)
+        self._edge_buffer.draw()
 
-        glBegin(GL_QUADS)
-        for i in range(len(self.vertices)):
-            x1, y1 = self.vertices[i]
-            x2, y2 = self.vertices[(i + 1) % len(self.vertices)]
-
-            dx = x2 - x1
-            dy = y2 - y1
-            length = math.sqrt(dx * dx + dy * dy)
-            if length == 0:
-                continue
-
-            # Vetor perpendicular normalizado para espessura
-            nx = -dy / length
-            ny = dx / length
-
-            # deslocamento para dar espessura
-            offset_x = nx * half_w
-            offset_y = ny * half_w
-
-            # 4 vértices do retângulo
-            glVertex2f(x1 + offset_x, y1 + offset_y)
-            glVertex2f(x1 - offset_x, y1 - offset_y)
-            glVertex2f(x2 - offset_x, y2 - offset_y)
-            glVertex2f(x2 + offset_x, y2 + offset_y)
-        glEnd()
+    def iter_fill(self, block_rows=4096):
+        """
+        Segmentos de preenchimento em blocos de linhas, em ordem de y. Usa os
+        segmentos de fill() quando estão atualizados; senão calcula em streaming,
+        sem montar a lista inteira (polígonos muito grandes).
+        """
+        if self.filled_segments and not self._dirty_rows:
+            yield self.filled_segments
+            return
+        for spans in iter_polygon_filling(self.vertices, block_rows):
+            yield SpanSet.from_spans(spans)
 
     def draw_fill(self):
-        """Desenha preenchimento: linhas e pontos conforme `filled_segments`."""
-        if not self.filled_segments:
+        """
+        Desenha o preenchimento como retângulos (runs verticais dos segmentos) num
+        VBO, com uma única chamada. O VBO é refeito só quando o polígono muda.
+        """
+        if len(self.vertices) < 3:
             return
             
         glColor3f(*self.color)
-        
-        # Segmentos como linhas horizontais
-        glBegin(GL_LINES)
-        for y, x1, x2 in self.filled_segments:
-            glVertex2f(x1, y)
-            glVertex2f(x2, y)
-        glEnd()
-        
-        # Alternativa: pontos para maior visibilidade
-        glPointSize(1.0)
-        glBegin(GL_POINTS)
-        for y, x1, x2 in self.filled_segments:
-            for x in range(int(x1), int(x2) + 1):
-                glVertex2f(x, y)
-        glEnd()
+
+        if self._fill_buffer.key != self._revision:
+            blocks = [runs_to_triangles(spans.vertical_runs()) for spans in self.iter_fill()]
+            triangles = np.concatenate(blocks) if blocks else np.empty((0, 2), dtype=np.float32)
+            self._fill_buffer.upload(triangles, self._revision)
+        self._fill_buffer.draw()
@@ -0,0 +1,57 @@
+import math
+
+
+def _distance_to_segment(p, a, b):
+    """Distância do ponto p ao segmento a-b."""
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return math.hypot(p[0] - a[0], p[1] - a[1])
+    t = max(0.0, min(1.0, ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / length_sq))
+    return math.hypot(p[0] - (a[0] + t * dx), p[1] - (a[1] + t * dy))
+
+
+class StreamingSimplifier:
+    """
+    Douglas–Peucker online (janela deslizante) para traços à mão livre.
+
+    Guarda a âncora (último vértice emitido) e os pontos recebidos depois
+    dela. Enquanto todos ficam a até `tolerance` do segmento âncora -> ponto
+    novo, o ponto novo só estende a janela. Quando algum passa da tolerância,
+    o ponto anterior vira vértice e passa a ser a âncora. A janela é limitada
+    a `max_window` pontos, então cada ponto custa O(max_window) no pior caso.
+    """
+    def __init__(self, tolerance=2.0, max_window=256):
+        self.tolerance = tolerance
+        self.max_window = max_window
+        self.anchor = None
+        self.window = []
+
+    def add(self, point):
+        """Recebe um ponto do traço; retorna os vértices confirmados (lista, possivelmente vazia)."""
+        point = tuple(point)
+        if self.anchor is None:
+            self.anchor = point
+            return [point]
+        if point == self.anchor or (self.window and point == self.window[-1]):
+            return []
+
+        fits = len(self.window) < self.max_window and all(
+            _distance_to_segment(p, self.anchor, point) <= self.tolerance for p in self.window)
+        if fits:
+            self.window.append(point)
+            return []
+
+        # O ponto anterior fecha o trecho simplificado e vira a nova âncora
+        vertex = self.window[-1]
+        self.anchor = vertex
+        self.window = [point]
+        return [vertex]
+
+    def finish(self):
+        """Fim do traço: confirma o último ponto pendente. Retorna lista de vértices."""
+        vertices = self.window[-1:]
+        if vertices:
+            self.anchor = vertices[0]
+        self.window = []
+        return vertices
@@ -0,0 +1,218 @@
+import numpy as np
+try:
+    from .filling import SPAN_DTYPE
+    from .trapezoids import TRAPEZOID_DTYPE
+except ImportError:
+    from filling import SPAN_DTYPE
+    from trapezoids import TRAPEZOID_DTYPE
+
+# Retângulo de preenchimento: linhas y_start <= y < y_end, de x1 a x2
+RUN_DTYPE = np.dtype([('y_start', np.int32), ('y_end', np.int32), ('x1', np.int32), ('x2', np.int32)])
+
+
+class SpanSet:
+    """
+    Segmentos de preenchimento (y, x1, x2) em arrays int32.
+
+    x1/x2 ficam ordenados por (y, x) e offsets indexa as linhas: os segmentos
+    da linha y0 + i estão em [offsets[i], offsets[i + 1]). Acesso a uma linha
+    é O(1). Iterar produz tuplas (y, x1, x2), como a antiga lista.
+    """
+    def __init__(self, y0=0, offsets=None, x1=None, x2=None):
+        self.y0 = int(y0)
+        self.offsets = np.zeros(1, dtype=np.int32) if offsets is None else np.asarray(offsets, dtype=np.int32)
+        self.x1 = np.empty(0, dtype=np.int32) if x1 is None else np.asarray(x1, dtype=np.int32)
+        self.x2 = np.empty(0, dtype=np.int32) if x2 is None else np.asarray(x2, dtype=np.int32)
+
+    @classmethod
+    def from_spans(cls, spans):
+        """A partir de um array SPAN_DTYPE ou de uma lista de tuplas (y, x1, x2)."""
+        if isinstance(spans, SpanSet):
+            return spans
+        spans = np.asarray(spans if len(spans) else np.empty(0, dtype=SPAN_DTYPE), dtype=SPAN_DTYPE)
+        if len(spans) == 0:
+            return cls()
+
+        return cls._from_sorted(spans[np.lexsort((spans['x1'], spans['y']))])
+
+    @classmethod
+    def _from_sorted(cls, spans):
+        """Array SPAN_DTYPE já ordenado por (y, x1)."""
+        if len(spans) == 0:
+            return cls()
+        y0 = int(spans['y'][0])
+        counts = np.bincount(spans['y'] - y0)
+        offsets = np.zeros(len(counts) + 1, dtype=np.int32)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(y0, offsets, spans['x1'], spans['x2'])
+
+    @property
+    def y_end(self):
+        """Linha final (exclusiva)."""
+        return self.y0 + len(self.offsets) - 1
+
+    def __len__(self):
+        return len(self.x1)
+
+    def __bool__(self):
+        return len(self.x1) > 0
+
+    def __iter__(self):
+        ys = np.repeat(np.arange(self.y0, self.y_end), np.diff(self.offsets))
+        return zip(ys.tolist(), self.x1.tolist(), self.x2.tolist())
+
+    def row(self, y):
+        """(x1, x2) dos segmentos da linha y, como arrays."""
+        i = y - self.y0
+        if i < 0 or i >= len(self.offsets) - 1:
+            return self.x1[:0], self.x2[:0]
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.x1[start:end], self.x2[start:end]
+
+    def hole_rows(self):
+        """Linhas com mais de um segmento (buracos ou concavidades)."""
+        return int(np.count_nonzero(np.diff(self.offsets) > 1))
+
+    def to_array(self):
+        spans = np.empty(len(self), dtype=SPAN_DTYPE)
+        spans['y'] = np.repeat(np.arange(self.y0, self.y_end), np.diff(self.offsets))
+        spans['x1'] = self.x1
+        spans['x2'] = self.x2
+        return spans
+
+    def splice(self, y_start, y_end, spans):
+        """
+        Substitui os segmentos das linhas y_start <= y < y_end pelos de `spans`
+        (SPAN_DTYPE ordenado, como o de polygon_filling_spans, só com linhas do
+        intervalo). Só o trecho das linhas trocadas é regravado em x1/x2; os
+        offsets seguintes são apenas deslocados.
+        """
+        spans = np.asarray(spans, dtype=SPAN_DTYPE)
+        if not self:
+            # Cópia: os arrays do conjunto não podem ser vistas do array de quem chamou
+            other = SpanSet._from_sorted(spans.copy())
+            self.y0, self.offsets, self.x1, self.x2 = other.y0, other.offsets, other.x1, other.x2
+            return
+        if len(spans):
+            self._extend_rows(int(spans['y'][0]), int(spans['y'][-1]) + 1)
+
+        rows = len(self.offsets) - 1
+        r0 = min(max(y_start - self.y0, 0), rows)
+        r1 = min(max(y_end - self.y0, r0), rows)
+        start, end = int(self.offsets[r0]), int(self.offsets[r1])
+        delta = len(spans) - (end - start)
+
+        if delta == 0:
+            self.x1[start:end] = spans['x1']
+            self.x2[start:end] = spans['x2']
+        else:
+            self.x1 = np.concatenate((self.x1[:start], spans['x1'], self.x1[end:]))
+            self.x2 = np.concatenate((self.x2[:start], spans['x2'], self.x2[end:]))
+            self.offsets[r1 + 1:] += delta
+        counts = np.bincount(spans['y'] - (self.y0 + r0), minlength=r1 - r0)
+        np.cumsum(counts, out=self.offsets[r0 + 1:r1 + 1])
+        self.offsets[r0 + 1:r1 + 1] += start
+        self._trim_rows()
+
+    def _extend_rows(self, y_start, y_end):
+        """Acrescenta linhas vazias para o índice cobrir y_start <= y < y_end."""
+        before = max(self.y0 - y_start, 0)
+        after = max(y_end - self.y_end, 0)
+        if before or after:
+            self.offsets = np.concatenate((np.zeros(before, dtype=np.int32), self.offsets,
+                                           np.full(after, self.offsets[-1], dtype=np.int32)))
+            self.y0 -= before
+
+    def _trim_rows(self):
+        """Descarta linhas vazias nas pontas do índice."""
+        if not self:
+            self.y0, self.offsets = 0, np.zeros(1, dtype=np.int32)
+            return
+        # Primeira linha com segmento e fim da última (offsets é não decrescente)
+        first = int(np.searchsorted(self.offsets, 0, side='right')) - 1
+        last = int(np.searchsorted(self.offsets, self.offsets[-1], side='left'))
+        if first > 0 or last < len(self.offsets) - 1:
+            self.offsets = self.offsets[first:last + 1].copy()
+            self.y0 += first
+
+    def vertical_runs(self):
+        """
+        Junta segmentos idênticos (mesmo x1 e x2) de linhas consecutivas em
+        retângulos (RUN_DTYPE), ordenados por y_start e x1.
+        """
+        if not self:
+            return np.empty(0, dtype=RUN_DTYPE)
+        spans = self.to_array()
+
+        # Em ordem de (x1, x2, y), um segmento continua o anterior se só y avançou 1
+        order = np.lexsort((spans['y'], spans['x2'], spans['x1']))
+        y, x1, x2 = spans['y'][order], spans['x1'][order], spans['x2'][order]
+        continues = np.r_[False, (x1[1:] == x1[:-1]) & (x2[1:] == x2[:-1]) & (y[1:] == y[:-1] + 1)]
+        starts = np.flatnonzero(~continues)
+        ends = np.r_[starts[1:], len(y)] - 1
+
+        runs = np.empty(len(starts), dtype=RUN_DTYPE)
+        runs['y_start'] = y[starts]
+        runs['y_end'] = y[ends] + 1
+        runs['x1'] = x1[starts]
+        runs['x2'] = x2[starts]
+        return runs[np.lexsort((runs['x1'], runs['y_start']))]
+
+    def trapezoids(self, tolerance=1.0):
+        """
+        Junta segmentos de linhas consecutivas cujas pontas variam linearmente
+        em trapézios (TRAPEZOID_DTYPE, linhas y0 <= y < y1).
+
+        Cada cadeia (o i-ésimo segmento de linhas seguidas com o mesmo número de
+        segmentos) mantém o intervalo de inclinações, a partir das pontas da
+        primeira linha, que deixa todas as pontas a até `tolerance` pixels da
+        reta. Quando o intervalo fica vazio a cadeia fecha e outra começa.
+        """
+        trapezoids = []
+
+        def close(run):
+            y_start, a0, b0, lo_a, hi_a, lo_b, hi_b, y_last = run[:8]
+            height = y_last + 1 - y_start
+            slope_a = (lo_a + hi_a) / 2.0 if y_last > y_start else 0.0
+            slope_b = (lo_b + hi_b) / 2.0 if y_last > y_start else 0.0
+            xl1 = a0 + slope_a * height
+            trapezoids.append((y_start, y_start + height, a0, b0, xl1, max(xl1, b0 + slope_b * height)))
+
+        def extend(run, y, a, b):
+            y_start, a0, b0, lo_a, hi_a, lo_b, hi_b, _, prev_a, prev_b = run
+            # Segmentos precisam se tocar na vertical para formar uma só face
+            if a > prev_b or b < prev_a:
+                return False
+            dy = y - y_start
+            lo_a, hi_a = max(lo_a, (a - tolerance - a0) / dy), min(hi_a, (a + tolerance - a0) / dy)
+            lo_b, hi_b = max(lo_b, (b - tolerance - b0) / dy), min(hi_b, (b + tolerance - b0) / dy)
+            if lo_a > hi_a or lo_b > hi_b:
+                return False
+            run[3:] = [lo_a, hi_a, lo_b, hi_b, y, a, b]
+            return True
+
+        def start(y, a, b):
+            inf = float('inf')
+            return [y, a, b, -inf, inf, -inf, inf, y, a, b]
+
+        offsets = self.offsets.tolist()
+        x1, x2 = self.x1.tolist(), self.x2.tolist()
+        runs = []
+        for i in range(len(offsets) - 1):
+            y = self.y0 + i
+            row = list(zip(x1[offsets[i]:offsets[i + 1]], x2[offsets[i]:offsets[i + 1]]))
+            if len(row) != len(runs):
+                # Mudou a topologia da linha (buraco abriu ou fechou): todas as cadeias fecham
+                for run in runs:
+                    close(run)
+                runs = [start(y, a, b) for a, b in row]
+                continue
+            for k, (a, b) in enumerate(row):
+                if not extend(runs[k], y, a, b):
+                    close(runs[k])
+                    runs[k] = start(y, a, b)
+        for run in runs:
+            close(run)
+
+        result = np.array(trapezoids, dtype=TRAPEZOID_DTYPE)
+        return result[np.lexsort((result['xl0'], result['y0']))]
@@ -0,0 +1,122 @@
+import numpy as np
+
+# Trapézio entre as linhas y0 < y1: lado esquerdo de xl0 a xl1, direito de xr0 a xr1
+TRAPEZOID_DTYPE = np.dtype([('y0', np.float64), ('y1', np.float64),
+                            ('xl0', np.float64), ('xr0', np.float64),
+                            ('xl1', np.float64), ('xr1', np.float64)])
+
+
+def _edges(polygon):
+    """Arestas não horizontais orientadas de baixo para cima: arrays (n, 2) inferior e superior."""
+    vertices = np.asarray(polygon, dtype=np.float64).reshape(len(polygon), -1)[:, :2]
+    a = vertices
+    b = np.roll(vertices, -1, axis=0)
+    keep = a[:, 1] != b[:, 1]
+    a, b = a[keep], b[keep]
+    flip = a[:, 1] > b[:, 1]
+    lower = np.where(flip[:, None], b, a)
+    upper = np.where(flip[:, None], a, b)
+    return lower, upper
+
+
+def _x_at(lower, upper, y):
+    """x das arestas na altura y (y dentro do intervalo de cada aresta)."""
+    t = (y - lower[:, 1]) / (upper[:, 1] - lower[:, 1])
+    return lower[:, 0] + t * (upper[:, 0] - lower[:, 0])
+
+
+def _crossings(lower, upper, ya, yb):
+    """Alturas, estritamente entre ya e yb, em que pares das arestas dadas se cruzam."""
+    # Na faixa cada aresta é x = xa + (y - ya) * k; o cruzamento de i e j é onde os x se igualam
+    xa = _x_at(lower, upper, ya)
+    k = (upper[:, 0] - lower[:, 0]) / (upper[:, 1] - lower[:, 1])
+    dx = xa[:, None] - xa[None, :]
+    dk = k[None, :] - k[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y = ya + dx / dk
+    y = y[np.isfinite(y) & (y > ya) & (y < yb)]
+    return np.unique(y)
+
+
+def polygon_trapezoids(polygon):
+    """
+    Decompõe o polígono em trapézios com a regra par-ímpar (a mesma do scanline),
+    então buracos de polígonos com auto-interseção são preservados.
+
+    As alturas dos vértices dividem o plano em faixas; dentro de cada faixa as
+    arestas ativas não se cruzam (faixas com cruzamento são subdivididas na
+    altura de cada cruzamento), então ordenadas por x elas formam pares
+    esquerda/direita. Um par que continua nas faixas seguintes vira um único
+    trapézio, então o resultado tem O(vértices + cruzamentos) trapézios, sem
+    depender da altura em pixels. Retorna um array TRAPEZOID_DTYPE.
+    """
+    if len(polygon) < 3:
+        return np.empty(0, dtype=TRAPEZOID_DTYPE)
+    lower, upper = _edges(polygon)
+    if len(lower) == 0:
+        return np.empty(0, dtype=TRAPEZOID_DTYPE)
+
+    levels = np.unique(np.concatenate((lower[:, 1], upper[:, 1])))
+    # Par (aresta esquerda, aresta direita) -> [y inicial, y final] do trapézio aberto
+    open_pairs = {}
+    trapezoids = []
+
+    # Escalares: um trapézio só precisa de quatro x, NumPy aqui custaria mais que o cálculo
+    edge_lower, edge_upper = lower.tolist(), upper.tolist()
+
+    def x_at(edge, y):
+        (ax, ay), (bx, by) = edge_lower[edge], edge_upper[edge]
+        return ax + (y - ay) * (bx - ax) / (by - ay)
+
+    def close(pair, span):
+        y0, y1 = span
+        left, right = pair
+        trapezoids.append((y0, y1, x_at(left, y0), x_at(right, y0), x_at(left, y1), x_at(right, y1)))
+
+    for ya, yb in zip(levels[:-1], levels[1:]):
+        active = np.flatnonzero((lower[:, 1] <= ya) & (upper[:, 1] >= yb))
+        slabs = [ya, yb]
+        if len(active) > 1:
+            xa = _x_at(lower[active], upper[active], ya)
+            xb = _x_at(lower[active], upper[active], yb)
+            if not np.array_equal(np.lexsort((xb, xa)), np.lexsort((xa, xb))):
+                slabs = [ya, *_crossings(lower[active], upper[active], ya, yb), yb]
+
+        for y0, y1 in zip(slabs[:-1], slabs[1:]):
+            pairs = set()
+            if len(active) > 1:
+                xm = _x_at(lower[active], upper[active], (y0 + y1) / 2.0)
+                order = active[np.argsort(xm, kind='stable')]
+                # Aresta sem par (só ocorre com erro numérico) é descartada
+                count = len(order) // 2 * 2
+                pairs = set(zip(order[0:count:2].tolist(), order[1:count:2].tolist()))
+
+            for pair in [pair for pair in open_pairs if pair not in pairs]:
+                close(pair, open_pairs.pop(pair))
+            for pair in pairs:
+                if pair in open_pairs:
+                    open_pairs[pair][1] = y1
+                else:
+                    open_pairs[pair] = [y0, y1]
+
+    for pair, span in open_pairs.items():
+        close(pair, span)
+
+    result = np.array(trapezoids, dtype=TRAPEZOID_DTYPE)
+    return result[np.lexsort((result['xl0'], result['y0']))]
+
+
+def trapezoid_triangles(trapezoids):
+    """
+    Triângulos (m, 3, 2) dos trapézios, no sentido anti-horário (xy). Um lado
+    de largura zero (ponta do trapézio) gera só um triângulo.
+    """
+    t = trapezoids
+    bl = np.stack((t['xl0'], t['y0']), axis=1)
+    br = np.stack((t['xr0'], t['y0']), axis=1)
+    tr = np.stack((t['xr1'], t['y1']), axis=1)
+    tl = np.stack((t['xl1'], t['y1']), axis=1)
+
+    lower = np.stack((bl, br, tr), axis=1)[t['xr0'] > t['xl0']]
+    upper = np.stack((bl, tr, tl), axis=1)[t['xr1'] > t['xl1']]
+    return np.concatenate((lower, upper))
@@ -0,0 +1,80 @@
+from OpenGL.GL import *
+import numpy as np
+
+
+def runs_to_triangles(runs):
+    """
+    Dois triângulos por retângulo de preenchimento (RUN_DTYPE): cobre os pixels
+    x1..x2 das linhas y_start..y_end-1. Retorna float32 (n * 6, 2).
+    """
+    x1 = runs['x1'].astype(np.float32)
+    x2 = runs['x2'].astype(np.float32) + 1.0
+    y1 = runs['y_start'].astype(np.float32)
+    y2 = runs['y_end'].astype(np.float32)
+    xs = np.stack((x1, x2, x2, x1, x2, x1), axis=1)
+    ys = np.stack((y1, y1, y2, y1, y2, y2), axis=1)
+    return np.stack((xs, ys), axis=2).reshape(-1, 2)
+
+
+def edges_to_triangles(vertices, thickness):
+    """
+    Arestas do polígono fechado como retângulos de espessura `thickness`
+    (dois triângulos cada), como Polygon.draw_edges. Retorna float32 (n * 6, 2).
+    """
+    a = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+    b = np.roll(a, -1, axis=0)
+    d = b - a
+    length = np.hypot(d[:, 0], d[:, 1])
+    keep = length > 0
+    a, b, d, length = a[keep], b[keep], d[keep], length[keep]
+
+    # Vetor perpendicular normalizado, metade da espessura para cada lado
+    offset = np.stack((-d[:, 1], d[:, 0]), axis=1) / length[:, None] * (thickness / 2.0)
+    corners = (a + offset, a - offset, b - offset, b + offset)
+    quads = np.stack([corners[i] for i in (0, 1, 2, 0, 2, 3)], axis=1)
+    return quads.reshape(-1, 2).astype(np.float32)
+
+
+class VertexBuffer:
+    """
+    VBO de vértices 2D (float32) desenhado com uma única chamada glDrawArrays.
+    `key` identifica o conteúdo enviado: quem desenha só chama upload() quando
+    a chave muda. O buffer de GL é criado no primeiro upload (precisa de contexto).
+    """
+    def __init__(self, mode=GL_TRIANGLES):
+        self.mode = mode
+        self.buffer_id = None
+        self.count = 0
+        self.key = None
+
+    def upload(self, vertices, key=None):
+        vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 2)
+        self.key = key
+        self.count = len(vertices)
+        if self.count == 0:
+            return
+        if self.buffer_id is None:
+            self.buffer_id = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer_id)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self):
+        if self.buffer_id is None or self.count == 0:
+            return
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer_id)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        try:
+            glVertexPointer(2, GL_FLOAT, 0, None)
+            glDrawArrays(self.mode, 0, self.count)
+        finally:
+            glDisableClientState(GL_VERTEX_ARRAY)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def release(self):
+        """Apaga o buffer de GL; o próximo upload() cria outro."""
+        if self.buffer_id is not None:
+            glDeleteBuffers(1, [self.buffer_id])
+        self.buffer_id = None
+        self.count = 0
+        self.key = None
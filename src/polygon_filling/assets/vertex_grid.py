@@ -0,0 +1,51 @@
+import math
+
+
+class VertexGrid:
+    """
+    Grade uniforme sobre os vértices do polígono para achar o vértice mais
+    próximo do cursor sem percorrer todos. Cada célula de `cell_size` pixels
+    guarda os ids (estáveis) dos vértices dentro dela; inserir, mover e
+    remover custam O(1) e a busca só olha as células ao alcance do raio.
+    """
+    def __init__(self, cell_size=16.0):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.positions = {}
+
+    def _cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def insert(self, vertex_id, x, y):
+        self.positions[vertex_id] = (x, y)
+        self.cells.setdefault(self._cell(x, y), set()).add(vertex_id)
+
+    def remove(self, vertex_id):
+        x, y = self.positions.pop(vertex_id)
+        cell = self._cell(x, y)
+        ids = self.cells[cell]
+        ids.discard(vertex_id)
+        if not ids:
+            del self.cells[cell]
+
+    def move(self, vertex_id, x, y):
+        self.remove(vertex_id)
+        self.insert(vertex_id, x, y)
+
+    def clear(self):
+        self.cells.clear()
+        self.positions.clear()
+
+    def nearest(self, x, y, radius):
+        """Id do vértice mais próximo de (x, y) a até `radius`, ou None."""
+        cx0, cy0 = self._cell(x - radius, y - radius)
+        cx1, cy1 = self._cell(x + radius, y + radius)
+        best, best_distance = None, radius * radius
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for vertex_id in self.cells.get((cx, cy), ()):
+                    vx, vy = self.positions[vertex_id]
+                    distance = (vx - x) ** 2 + (vy - y) ** 2
+                    if distance <= best_distance:
+                        best, best_distance = vertex_id, distance
+        return best
@@ -3,6 +3,7 @@ from OpenGL.GLU import *
 from OpenGL.GLUT import *
 from polygon_filling.assets.polygon import Polygon
 from polygon_filling.assets.mouse import handle_modeling_mouse
+from polygon_filling.assets.simplify import StreamingSimplifier
 
 class PolygonEditor:
     """Editor 2D minimalista: captura vértices, aplica scanline e desenha UI."""
@@ -11,6 +12,16 @@ class PolygonEditor:
         self.current_polygon = None
         self.completion_callback = None
         self.is_active = False
+        # Mão livre: arrastar com o botão esquerdo desenha; os pontos do traço
+        # são simplificados enquanto chegam (tolerância em pixels)
+        self.freehand = False
+        self.freehand_tolerance = 2.0
+        self._simplifier = None
+        # Edição de vértices: clique perto de um vértice seleciona e arrasta;
+        # Delete/Backspace remove o selecionado
+        self.pick_radius = 8.0
+        self.selected_vertex = None
+        self._dragging = False
     
     def start_modeling(self, completion_callback=None):
         """Inicia sessão: cria `Polygon`, define callback e ativa editor."""
@@ -21,14 +32,24 @@ class PolygonEditor:
     
     def stop_modeling(self):
         """Finaliza sessão e limpa polígono atual."""
+        if self.current_polygon:
+            self.current_polygon.release()
         self.is_active = False
         self.current_polygon = None
+        self._simplifier = None
+        self.selected_vertex = None
+        self._dragging = False
         print("Modelagem finalizada")
     
     def handle_mouse(self, button, state, x, y):
         """Encaminha cliques ao handler; finaliza com clique direito."""
         if not self.is_active:
             return False
+
+        if self.freehand and button == GLUT_LEFT_BUTTON:
+            return self._handle_freehand_button(state, x, y)
+        if button == GLUT_LEFT_BUTTON and self._handle_vertex_pick(state, x, y):
+            return True
         
         result = handle_modeling_mouse(button, state, x, y, self.current_polygon, self._on_polygon_complete)
         
@@ -39,6 +60,82 @@ class PolygonEditor:
         
         return result
     
+    def handle_motion(self, x, y):
+        """Arrasto com botão pressionado: move o vértice selecionado ou estende o traço à mão livre."""
+        if not self.is_active:
+            return False
+        if self._dragging and self.selected_vertex is not None:
+            self.current_polygon.move_vertex(self.selected_vertex, *self._to_polygon_space(x, y))
+            glutPostRedisplay()
+            return True
+        if self._simplifier is None:
+            return False
+        self._add_vertices(self._simplifier.add(self._to_polygon_space(x, y)))
+        return True
+
+    def handle_keyboard(self, key):
+        """'f' alterna entre cliques (um vértice por clique) e desenho à mão livre."""
+        if not self.is_active:
+            return False
+        if key in (b'f', b'F'):
+            self.freehand = not self.freehand
+            self._simplifier = None
+            print(f"Desenho à mão livre {'ativado' if self.freehand else 'desativado'} (tolerância {self.freehand_tolerance} px)")
+            return True
+        if key in (b'\x7f', b'\x08') and self.selected_vertex is not None:
+            self.current_polygon.remove_vertex(self.selected_vertex)
+            print(f"Vértice {self.selected_vertex} removido")
+            self.selected_vertex = None
+            self._dragging = False
+            glutPostRedisplay()
+            return True
+        return False
+
+    def _handle_vertex_pick(self, state, x, y):
+        """
+        Botão esquerdo: pressionar perto de um vértice o seleciona e começa o
+        arrasto (grade de vértices do polígono, sem varrer a lista); soltar
+        termina. Retorna False se o clique deve adicionar um vértice novo.
+        """
+        if state != GLUT_DOWN:
+            if self._dragging:
+                self._dragging = False
+                return True
+            return False
+        if not self.current_polygon:
+            return False
+
+        index = self.current_polygon.find_vertex(*self._to_polygon_space(x, y), self.pick_radius)
+        if index is None:
+            self.selected_vertex = None
+            return False
+        self.selected_vertex = index
+        self._dragging = True
+        glutPostRedisplay()
+        return True
+
+    def _handle_freehand_button(self, state, x, y):
+        """Botão esquerdo no modo mão livre: pressionar começa o traço, soltar termina."""
+        if state == GLUT_DOWN:
+            self._simplifier = StreamingSimplifier(self.freehand_tolerance)
+            self._add_vertices(self._simplifier.add(self._to_polygon_space(x, y)))
+        elif self._simplifier is not None:
+            self._add_vertices(self._simplifier.finish())
+            self._simplifier = None
+            print(f"Traço concluído: polígono com {len(self.current_polygon.vertices)} vértices")
+        return True
+
+    def _to_polygon_space(self, x, y):
+        # Mesma conversão de handle_modeling_mouse: origem no canto inferior esquerdo
+        return [x, glutGet(GLUT_WINDOW_HEIGHT) - y]
+
+    def _add_vertices(self, vertices):
+        if not vertices or not self.current_polygon:
+            return
+        for vx, vy in vertices:
+            self.current_polygon.add_vertex(vx, vy)
+        glutPostRedisplay()
+
     def _on_polygon_complete(self, polygon):
         """Preenche (se preciso), reporta segmentos e dispara callback externo."""
         if self.completion_callback:
@@ -87,6 +184,14 @@ class PolygonEditor:
             glVertex2f(vertex[0], vertex[1])
         
         glEnd()
+
+        # Vértice selecionado em destaque
+        if self.selected_vertex is not None and self.selected_vertex < len(self.current_polygon.vertices):
+            glColor3f(1.0, 0.3, 0.3)
+            glPointSize(10.0)
+            glBegin(GL_POINTS)
+            glVertex2f(*self.current_polygon.vertices[self.selected_vertex])
+            glEnd()
     
     def get_current_polygon_vertices(self):
         """Retorna cópia dos vértices atuais (para consumo externo)."""
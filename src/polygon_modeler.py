@@ -65,6 +65,18 @@ class PolygonModeler:
         # Delegar para o editor de polígonos
         return self.polygon_editor.handle_mouse(button, state, x, y)
     
+    def handle_motion(self, x, y):
+        """Encaminha arrastos do mouse ao editor (desenho à mão livre)."""
+        if not self.is_modeling_active():
+            return False
+        return self.polygon_editor.handle_motion(x, y)
+
+    def handle_keyboard(self, key):
+        """Encaminha teclas ao editor enquanto ativo ('f' alterna mão livre)."""
+        if not self.is_modeling_active():
+            return False
+        return self.polygon_editor.handle_keyboard(key)
+
     def render_modeling_interface(self):
         """Renderiza preenchimento (scanline), bordas e vértices em 2D."""
         if not self.is_modeling_active():
@@ -78,7 +90,11 @@ class PolygonModeler:
         if polygon and len(polygon.vertices) >= 3:
             # Verificar se polígono é válido para extrusão
             if not polygon.is_valid_for_extrusion():
-                print("Erro: polígono inválido - contém pontos colineares")
+                crossings = polygon.find_self_intersections()
+                if crossings:
+                    print(f"Erro: polígono inválido - {len(crossings)} par(es) de arestas se cruzam, ex.: {crossings[:3]}")
+                else:
+                    print("Erro: polígono inválido - contém pontos colineares")
                 self.stop_modeling()
                 return
             
@@ -88,26 +104,19 @@ class PolygonModeler:
             if filled_segments:
                 print(f"Criando objeto 3D com {len(filled_segments)} segmentos de preenchimento")
                 
-                # Analisar se há buracos para feedback
-                y_lines = {}
-                for y, x1, x2 in filled_segments:
-                    if y not in y_lines:
-                        y_lines[y] = 0
-                    y_lines[y] += 1
-                
-                holes = sum(1 for count in y_lines.values() if count > 1)
-                if holes > 0:
-                    print(f"  → Polígono com buracos detectados em {holes} linhas")
+                # Sem auto-interseção não há buracos: linhas com vários segmentos vêm de concavidades
+                concave_rows = filled_segments.hole_rows()
+                if concave_rows > 0:
+                    print(f"  → Polígono côncavo: {concave_rows} linhas com mais de um segmento")
                 else:
-                    print("  → Polígono sólido (sem buracos)")
+                    print("  → Polígono convexo na horizontal (um segmento por linha)")
             else:
                 print("Aviso: Criando objeto 3D sem dados de preenchimento")
             
-            # Converter para objeto 3D com dados de preenchimento
+            # Converter para objeto 3D; as tampas saem dos vértices, não dos segmentos da tela
             extruded_obj = self._create_extruded_object(
                 polygon.vertices, 
-                self.modeling_data['depth'],
-                filled_segments
+                self.modeling_data['depth']
             )
             
             # Chamar callback para adicionar à cena
@@ -123,17 +132,17 @@ class PolygonModeler:
         # Voltar para modo 3D
         self.stop_modeling()
     
-    def _create_extruded_object(self, vertices_2d, depth, filled_segments=None):
-        """Normaliza pontos 2D → mundo e cria `ExtrudedObject` com fill opcional."""
+    def _create_extruded_object(self, vertices_2d, depth):
+        """Normaliza pontos 2D → mundo e cria `ExtrudedObject` a partir dos vértices."""
         # Normalizar coordenadas 2D para espaço 3D
         normalized_vertices = self._normalize_2d_to_3d(vertices_2d)
         
-        # Criar objeto extrudado com dados de preenchimento
+        # Criar objeto extrudado; as tampas são geradas a partir dos vértices no
+        # espaço do mundo, sem depender do tamanho da janela
         extruded_obj = ExtrudedObject(
             base_vertices=normalized_vertices,
             depth=depth,
-            material='white_plastic',
-            filled_segments=filled_segments
+            material='white_plastic'
         )
         
         return extruded_obj
@@ -0,0 +1,231 @@
+"""
+Renderização offline (sem janela, GLUT ou imgui) com o Phong manual em software.
+
+Uso:
+    python render_offline.py cena.json -o saida.png
+    python render_offline.py cena.json -o quadros.ppm --deferred
+    python render_offline.py cena.json -o giro.png --turntable 36 --workers 8
+
+Cena (JSON), todos os campos opcionais exceto "objects":
+    {
+        "width": 640, "height": 480,
+        "projection": "perspective" | "ortho",
+        "background": [0.1, 0.1, 0.1],
+        "cull_back_faces": true,
+        "camera": {"yaw": 45, "pitch": 30, "distance": 8, "focal_point": [0, 0, 0]},
+        "light": {"position": [2, 5, 2, 1], "ambient": [...], "diffuse": [...], "specular": [...]},
+        "objects": [
+            {"shape": "cube", "material": "gold", "position": [0, 0, 0],
+             "rotation": [0, 0, 0], "scale": [1, 1, 1], "color": [1, 0, 0]},
+            {"shape": "extruded", "vertices": [[x, y], ...], "depth": 1.0, "material": "ruby",
+             "cap_mode": "triangulated" | "scanline", "fill_density": 40}
+        ],
+        "frames": [{"camera": {"yaw": 60}}, {"camera": {"yaw": 75}, "light": {...}}]
+    }
+
+Cada item de "frames" sobrescreve "camera"/"light" da cena; sem "frames" há um
+único quadro. "cull_back_faces": false desenha também as faces de costas.
+Com mais de um quadro, o índice é inserido antes da extensão
+da saída (saida_0000.png, saida_0001.png, ...).
+
+--turntable N substitui "frames" por N quadros com a câmera dando uma volta
+completa (yaw) ao redor do ponto focal. Com --workers > 1 os quadros são
+renderizados num pool de processos: cada processo carrega a cena uma única
+vez e grava seus quadros assim que ficam prontos.
+"""
+import argparse
+import json
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ui_controls.camera import Camera
+from object.object import Object
+from object.extruded_object import ExtrudedObject
+from light.lighting_models import LightingController
+from light.phong_manual import PhongManual
+from light.matrices import look_at, perspective, ortho, model_view
+from light.image_io import write_image
+
+
+def load_scene(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def build_object(description):
+    """Cria um objeto da cena a partir da sua descrição no JSON."""
+    shape = description.get('shape', 'cube').lower()
+    material = description.get('material', 'white_plastic')
+
+    if shape == 'cube':
+        obj = Object('cube', material=material)
+    elif shape == 'extruded':
+        vertices = [[x, y, 0.0] for x, y, *_ in description['vertices']]
+        obj = ExtrudedObject(vertices, description.get('depth', 1.0), material=material,
+                             cap_mode=description.get('cap_mode', 'triangulated'),
+                             fill_density=description.get('fill_density', 40.0))
+    else:
+        # Esfera, teapot etc. são desenhados pelo GLUT e não têm malha para o rasterizador
+        raise ValueError(f"Forma '{shape}' não suportada na renderização offline (use 'cube' ou 'extruded')")
+
+    if 'color' in description:
+        obj.set_color(*description['color'])
+    obj.set_position(*description.get('position', (0.0, 0.0, 0.0)))
+    obj.set_rotation(*description.get('rotation', (0.0, 0.0, 0.0)))
+    obj.set_scale(*description.get('scale', (1.0, 1.0, 1.0)))
+    return obj
+
+def projection_matrix(mode, width, height):
+    """Mesma projeção de main.projection_setup."""
+    aspect_ratio = width / height if height > 0 else 1.0
+    if mode == 'perspective':
+        return perspective(60.0, aspect_ratio, 0.1, 100.0)
+
+    view_radius = 5.0
+    if aspect_ratio >= 1:
+        return ortho(-view_radius * aspect_ratio, view_radius * aspect_ratio,
+                     -view_radius, view_radius, 0.1, 100.0)
+    return ortho(-view_radius, view_radius,
+                 -view_radius / aspect_ratio, view_radius / aspect_ratio, 0.1, 100.0)
+
+def turntable_frames(scene, count):
+    """count quadros com a câmera orbitando 360° em yaw, a partir da câmera da cena."""
+    start = scene.get('camera', {}).get('yaw', Camera().yaw)
+    return [{'camera': {'yaw': start + 360.0 * index / count}} for index in range(count)]
+
+def frame_path(output, index, count):
+    if count == 1:
+        return output
+    root, ext = os.path.splitext(output)
+    return f"{root}_{index:04d}{ext}"
+
+
+class OfflineRenderer:
+    """Cena carregada uma vez; render_frame(i) devolve a imagem RGB (float, linha 0 na base)."""
+    def __init__(self, scene, deferred=False, vectorized=True):
+        self.scene = scene
+        self.width = int(scene.get('width', 640))
+        self.height = int(scene.get('height', 480))
+        self.background = np.asarray(scene.get('background', (0.1, 0.1, 0.1))[:3], dtype=np.float32)
+        self.projection = projection_matrix(scene.get('projection', 'perspective'), self.width, self.height)
+        self.objects = [build_object(description) for description in scene['objects']]
+        self.frames = scene.get('frames') or [{}]
+
+        self.renderer = PhongManual()
+        self.renderer.vectorized = vectorized
+        self.renderer.cull_back_faces = scene.get('cull_back_faces', True)
+        self.renderer.update_size(self.width, self.height)
+        self.renderer.enable_deferred(deferred)
+
+    def frame_settings(self, index):
+        """Câmera e luz do quadro: valores da cena sobrescritos pelos do quadro."""
+        frame = self.frames[index]
+        camera = dict(self.scene.get('camera', {}), **frame.get('camera', {}))
+        light = dict(self.scene.get('light', {}), **frame.get('light', {}))
+        return camera, light
+
+    def render_frame(self, index):
+        settings, light = self.frame_settings(index)
+
+        camera = Camera()
+        camera.yaw = settings.get('yaw', camera.yaw)
+        camera.pitch = settings.get('pitch', camera.pitch)
+        camera.focal_point_distance = settings.get('distance', camera.focal_point_distance)
+        focal = settings.get('focal_point', (camera.focal_point_x, camera.focal_point_y, camera.focal_point_z))
+        camera.focal_point_x, camera.focal_point_y, camera.focal_point_z = focal
+        camera.update()
+        eye = (camera.camera_position_x, camera.camera_position_y, camera.camera_position_z)
+        view = look_at(eye, focal)
+
+        # Valores padrão da luz da interface (LightingController)
+        defaults = LightingController()
+        light_pos = light.get('position', defaults.light_position)
+        light_colors = {
+            'amb': light.get('ambient', defaults.light_ambient),
+            'dif': light.get('diffuse', defaults.light_diffuse),
+            'spec': light.get('specular', defaults.light_specular),
+        }
+
+        renderer = self.renderer
+        viewport = (0, 0, self.width, self.height)
+        renderer.begin_frame()
+        renderer.framebuffer.clear()
+        for obj in self.objects:
+            renderer.submit_object(obj, model_view(obj, view), self.projection, viewport, light_pos, light_colors)
+        renderer.flush()
+
+        fb = renderer.framebuffer
+        return np.where(fb.covered()[..., None], fb.color, self.background)
+
+
+def render_serial(scene, paths, deferred, vectorized):
+    """Renderiza e grava os quadros em ordem; gera (índice, caminho, segundos) de cada um."""
+    offline = OfflineRenderer(scene, deferred=deferred, vectorized=vectorized)
+    for index, path in enumerate(paths):
+        start = time.perf_counter()
+        color = offline.render_frame(index)
+        elapsed = time.perf_counter() - start
+        write_image(path, color)
+        yield index, path, elapsed
+
+
+# ---- Lado do processo de trabalho ---- #
+
+_worker_renderer = None
+
+def _init_worker(scene, deferred, vectorized):
+    # A cena (geometria e materiais) é montada uma vez por processo
+    global _worker_renderer
+    _worker_renderer = OfflineRenderer(scene, deferred=deferred, vectorized=vectorized)
+
+def _render_worker(index, path):
+    start = time.perf_counter()
+    color = _worker_renderer.render_frame(index)
+    elapsed = time.perf_counter() - start
+    write_image(path, color)
+    return index, path, elapsed
+
+def render_parallel(scene, paths, workers, deferred, vectorized):
+    """Como render_serial, num pool de processos; os quadros chegam na ordem em que terminam."""
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(scene, deferred, vectorized)) as pool:
+        futures = [pool.submit(_render_worker, index, path) for index, path in enumerate(paths)]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Renderiza uma cena JSON com o Phong manual, sem janela.")
+    parser.add_argument('scene', help="arquivo JSON da cena")
+    parser.add_argument('-o', '--output', default='render.png', help="arquivo de saída (.png ou .ppm)")
+    parser.add_argument('--deferred', action='store_true', help="sombreamento deferred")
+    parser.add_argument('--scalar', action='store_true', help="caminho escalar (sem NumPy por span)")
+    parser.add_argument('--turntable', type=int, default=0, metavar='N',
+                        help="N quadros orbitando a câmera 360° em torno do ponto focal")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processos para renderizar quadros em paralelo (0 = todos os núcleos)")
+    args = parser.parse_args(argv)
+
+    scene = load_scene(args.scene)
+    if args.turntable > 0:
+        scene['frames'] = turntable_frames(scene, args.turntable)
+    count = len(scene.get('frames') or [{}])
+    paths = [frame_path(args.output, index, count) for index in range(count)]
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    start = time.perf_counter()
+    if workers > 1:
+        results = render_parallel(scene, paths, workers, args.deferred, not args.scalar)
+    else:
+        results = render_serial(scene, paths, args.deferred, not args.scalar)
+
+    for index, path, elapsed in results:
+        print(f"quadro {index}: {elapsed * 1000.0:.1f} ms -> {path}")
+
+    total = time.perf_counter() - start
+    print(f"{count} quadro(s) em {total:.2f} s ({count / total:.1f} quadros/s, {workers} processo(s))")
+
+
+if __name__ == '__main__':
+    main()
@@ -19,6 +19,9 @@ class ControlPanelState:
         # Profundidade do Polígono Arbitrário 
         self.polygon_depth_options = [str(i) for i in range(3, 11)] 
         self.polygon_depth_index = 0
+        # Desenho à mão livre (tecla 'f' durante a modelagem) e tolerância da simplificação
+        self.polygon_freehand = False
+        self.polygon_freehand_tolerance = 2.0
         
         # Opções de Iluminação (Lightning)
         self.lightning_options = ["Flat", "Gouraud", "Phong"]
@@ -33,6 +36,10 @@ class ControlPanelState:
         self.difuse_light = True
         self.specular_light = True
         self.phong_manual = False
+        self.phong_tiled = False
+        self.phong_deferred = False
+        self.phong_progressive = False
+        self.phong_frame_budget_ms = 16.0
 
 
 def draw_control_panel(state: ControlPanelState, add_object_callback=None, start_modeling_callback=None, add_light_callback=None, clear_scene=None, light_enabled=None):
@@ -114,6 +121,12 @@ def draw_control_panel(state: ControlPanelState, add_object_callback=None, start
 
         imgui.text(f"Profunidade: {state.polygon_depth_options[state.polygon_depth_index]}")
 
+        _, state.polygon_freehand = imgui.checkbox("Mão livre (arrastar)", state.polygon_freehand)
+        if state.polygon_freehand:
+            _, state.polygon_freehand_tolerance = imgui.slider_float(
+                "Tolerância (px)", state.polygon_freehand_tolerance, 0.5, 20.0
+            )
+
         
         imgui.text("")
         if imgui.button("Iniciar Modelagem"):
@@ -158,6 +171,14 @@ def draw_control_panel(state: ControlPanelState, add_object_callback=None, start
         # Phong manual
         if state.lightning_options[state.lightning_selected_index] == "Phong":
             _, state.phong_manual = imgui.checkbox("Phong Manual", state.phong_manual)
+            if state.phong_manual:
+                _, state.phong_tiled = imgui.checkbox("Tiles em paralelo (multi-core)", state.phong_tiled)
+                _, state.phong_deferred = imgui.checkbox("Sombreamento deferred", state.phong_deferred)
+                _, state.phong_progressive = imgui.checkbox("Renderização progressiva", state.phong_progressive)
+                if state.phong_progressive:
+                    _, state.phong_frame_budget_ms = imgui.slider_float(
+                        "Orçamento por frame (ms)", state.phong_frame_budget_ms, 2.0, 100.0
+                    )
             
         imgui.text("")
         if imgui.button("Adicionar fonte de luz"):